@@ -1,15 +1,33 @@
+import asyncio
+import time
+import urllib.request
+from enum import Enum
+
 import typer
 
-from peercache.parser.peer import Peer
+from peercache.parser.peer import DEFAULT_MEMORY_MB, Peer
 from peercache.parser.network import Network
+from peercache.parser.collector import ClusterCollector, StatsRecorder, format_sample
 from peercache.parser.manager import NetworkManager
+from peercache.parser.rebalance import Rebalancer
 from peercache.parser.registry import list_peers as registry_list
+from peercache.server.proxy import MemcachedProxy
 
 
 app = typer.Typer()
 manager: NetworkManager = NetworkManager()
 
 
+class PeerBackend(str, Enum):
+    """
+    Backends ``peer --start`` can launch. The in-process ones (``inprocess``,
+    ``null``) would die with this CLI process, so only the benchmark uses them.
+    """
+
+    memcached = "memcached"
+    python = "python"
+
+
 @app.command("manager")
 def network_manager(
     show: bool = typer.Option(False, "--show", help="Show all current networks."),
@@ -36,6 +54,43 @@ def network_command(
     remove: str = typer.Option(
         None, "--remove", help="Remove a peer from the network."
     ),
+    quorum: int = typer.Option(
+        None, "--quorum", help="Set the write quorum W (1 <= W <= replication)."
+    ),
+    hot_threshold: int = typer.Option(
+        None, "--hot-threshold", help="Promote keys seen this often (0 disables)."
+    ),
+    rebalance: bool = typer.Option(
+        False, "--rebalance", help="Copy moved keys to their current owners."
+    ),
+    rate: float = typer.Option(
+        None, "--rate", help="Rebalance throttle in bytes/sec (default: unlimited)."
+    ),
+    source: list[str] = typer.Option(
+        None, "--source", help="Extra peer to drain (e.g. one just removed)."
+    ),
+    weight: str = typer.Option(
+        None, "--weight", help="Set a peer's capacity weight: <peer>=<weight>."
+    ),
+    bounded_load: float = typer.Option(
+        None,
+        "--bounded-load",
+        help="Cap peers at (1+EPS)x the mean in-flight load (0 disables).",
+    ),
+    placement: str = typer.Option(
+        None,
+        "--placement",
+        help="Key placement: ring, rendezvous, jump or maglev.",
+    ),
+    watch: bool = typer.Option(
+        False, "--watch", help="Stream live cluster stats until interrupted."
+    ),
+    interval: float = typer.Option(
+        2.0, "--interval", help="Seconds between --watch refreshes."
+    ),
+    record: str = typer.Option(
+        None, "--record", help="With --watch, also append samples to this JSONL."
+    ),
 ):
     """
     Operate on an individual network by name.
@@ -48,12 +103,60 @@ def network_command(
 
     if show:
         typer.echo(network.stats())
+    elif watch:
+        recorder = StatsRecorder(network, record, interval) if record else None
+        collector = recorder.collector if recorder else ClusterCollector(network)
+        try:
+            while True:
+                sample = collector.sample()
+                typer.echo("\033[2J\033[H", nl=False)  # clear screen
+                typer.echo(format_sample(sample))
+                if recorder is not None:
+                    recorder.write(sample)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
     elif add:
         typer.echo(network.add_peer(add))
     elif remove:
         typer.echo(network.remove_peer(remove))
+    elif quorum:
+        typer.echo(network.set_write_quorum(quorum))
+    elif hot_threshold is not None:
+        typer.echo(network.set_hot_keys(hot_threshold))
+    elif weight:
+        peer_id, _, value = weight.partition("=")
+        try:
+            value = float(value)
+        except ValueError:
+            typer.echo("Use --weight <peer>=<weight>, e.g. --weight p0=128.")
+            raise typer.Exit(code=1)
+        typer.echo(network.set_weight(peer_id, value))
+    elif bounded_load is not None:
+        typer.echo(network.set_bounded_load(bounded_load))
+    elif placement:
+        typer.echo(network.set_placement(placement))
+    elif rebalance:
+        rebalancer = Rebalancer(
+            network,
+            bytes_per_sec=rate,
+            progress=lambda s: typer.echo(
+                f"  scanned {s['scanned']} | moved {s['moved']} "
+                f"| {s['bytes'] / 1_048_576:.1f} MB"
+            ),
+        )
+        totals = rebalancer.run(list(network.peers) + list(source or []))
+        typer.echo(
+            f"Rebalanced network '{name}': {totals['moved']} keys moved "
+            f"({totals['bytes']} bytes), {totals['expired']} expired, "
+            f"{totals['missing']} vanished."
+        )
     else:
-        typer.echo("Use one of: --show, --add <peer>, or --remove <peer>.")
+        typer.echo(
+            "Use one of: --show, --watch, --add <peer>, --remove <peer>, "
+            "--quorum <W>, --hot-threshold <N>, --weight <peer>=<W>, "
+            "--bounded-load <EPS>, --placement <NAME>, or --rebalance."
+        )
 
 
 @app.command("peer")
@@ -61,10 +164,20 @@ def peer_command(
     start: str = typer.Option(None, "--start", help="Start a new peer with given ID."),
     stop: str = typer.Option(None, "--stop", help="Stop a peer with given ID."),
     status: bool = typer.Option(False, "--status", help="Show all active peers."),
+    backend: PeerBackend = typer.Option(
+        PeerBackend.memcached,
+        "--backend",
+        help="Server for --start: memcached, or python (bundled stand-in).",
+    ),
+    memory_mb: int = typer.Option(
+        DEFAULT_MEMORY_MB,
+        "--memory-mb",
+        help="Server memory for --start; also the peer's default weight.",
+    ),
 ):
     if start:
         peer = Peer(start)
-        peer.start()
+        peer.start(memory_mb=memory_mb, backend=backend.value)
         typer.echo(f"Started peer '{start}'.")
     elif stop:
         peer = Peer(stop)
@@ -80,5 +193,45 @@ def peer_command(
         typer.echo("Use one of: --start <id>, --stop <id>, or --status.")
 
 
+@app.command("proxy")
+def proxy_command(
+    name: str = typer.Argument(..., help="Network to route for."),
+    port: int = typer.Option(11311, "--port", help="Port to listen on."),
+    host: str = typer.Option("localhost", "--host", help="Address to bind."),
+    connections: int = typer.Option(
+        2, "--connections", help="Pipelined backend connections per peer."
+    ),
+):
+    """
+    Serve the memcached protocol on one port, routed by the network's ring.
+    """
+    if name not in {n.name for n in manager.networks}:
+        typer.echo(f"Network '{name}' not found.")
+        raise typer.Exit(code=1)
+
+    proxy = MemcachedProxy(name, port, host, connections)
+    typer.echo(f"Proxying {host}:{port} → network '{name}' (Ctrl-C to stop).")
+    try:
+        asyncio.run(proxy.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("metrics")
+def metrics_command(
+    url: str = typer.Option(
+        None, "--url", help="Fetch and print a running exporter's /metrics."
+    ),
+):
+    """
+    Print a running exporter's phase metrics in the Prometheus text format.
+    """
+    if url:
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            typer.echo(resp.read().decode(), nl=False)
+    else:
+        typer.echo("Use --url <url> of an exporter started with METRICS.serve().")
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,121 @@
+import json
+import zlib
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+# Low byte of the memcached flags: how the payload was serialised. 0 is plain
+# UTF-8 text so values written before the codec existed still decode as str.
+FLAG_STR = 0
+FLAG_BYTES = 1
+FLAG_JSON = 2
+FLAG_KIND_MASK = 0xFF
+
+# High bits: transforms applied on top of the payload.
+FLAG_ZLIB = 1 << 8
+# Set on a small manifest stored under the main key of a value that was split
+# into chunks; the chunks themselves live under ``<key>#<i>``.
+FLAG_MANIFEST = 1 << 9
+
+
+class Item(NamedTuple):
+    """A stored payload together with its memcached flags."""
+
+    value: bytes
+    flags: int = FLAG_STR
+
+
+class ValueCodec:
+    """
+    Turns values into ``Item`` payloads and back.
+
+    ``bytes`` pass through untouched, ``str`` is UTF-8 encoded and anything
+    else is JSON-serialised. Payloads of at least ``compress_threshold`` bytes
+    (0 disables) are zlib-compressed when that actually makes them smaller.
+    """
+
+    def __init__(self, compress_threshold: int = 0, level: int = 1) -> None:
+        self.compress_threshold = compress_threshold
+        self.level = level
+
+    def encode(self, value: Any) -> Item:
+        if isinstance(value, bytes):
+            data, flags = value, FLAG_BYTES
+        elif isinstance(value, (bytearray, memoryview)):
+            # pymemcache only sends real bytes; this is the single copy.
+            data, flags = bytes(value), FLAG_BYTES
+        elif isinstance(value, str):
+            data, flags = value.encode(), FLAG_STR
+        else:
+            data, flags = json.dumps(value, separators=(",", ":")).encode(), FLAG_JSON
+
+        if self.compress_threshold and len(data) >= self.compress_threshold:
+            packed = zlib.compress(data, self.level)
+            if len(packed) < len(data):
+                data, flags = packed, flags | FLAG_ZLIB
+        return Item(data, flags)
+
+    def decode(self, item: Item) -> Any:
+        data, flags = item
+        if flags & FLAG_ZLIB:
+            data = zlib.decompress(data)
+        kind = flags & FLAG_KIND_MASK
+        if kind == FLAG_BYTES:
+            return data
+        if kind == FLAG_JSON:
+            return json.loads(data)
+        try:
+            return data.decode()
+        except UnicodeDecodeError:
+            # Raw binary written by a client that doesn't set flags.
+            return data
+
+
+def chunk_key(key: str, index: int) -> str:
+    return f"{key}#{index}"
+
+
+def chunk_parent(ckey: str) -> str:
+    """The main key a ``chunk_key`` belongs to."""
+    return ckey.rsplit("#", 1)[0]
+
+
+class Manifest(NamedTuple):
+    """Describes a chunked value: chunk count, total size and original flags."""
+
+    chunks: int
+    size: int
+    flags: int
+    crc: int
+
+    def to_item(self) -> Item:
+        return Item(json.dumps(list(self)).encode(), FLAG_MANIFEST)
+
+    @classmethod
+    def from_item(cls, item: Item) -> "Manifest":
+        return cls(*json.loads(item.value))
+
+
+def split_chunks(item: Item, chunk_size: int) -> Tuple[Manifest, List[bytes]]:
+    """Cut an encoded item into ``chunk_size`` pieces plus its manifest."""
+    view = memoryview(item.value)
+    chunks = [
+        bytes(view[off : off + chunk_size]) for off in range(0, len(view), chunk_size)
+    ]
+    manifest = Manifest(len(chunks), len(view), item.flags, zlib.crc32(view))
+    return manifest, chunks
+
+
+def join_chunks(manifest: Manifest, chunks: List[Optional[Item]]) -> Optional[Item]:
+    """
+    Reassemble chunks with a single join (one allocation, one copy).
+
+    Returns ``None`` if any chunk is missing or the result doesn't match the
+    manifest (e.g. chunks from two different writes), so a partial value is
+    always treated as a miss. The payload is immutable ``bytes``, like an
+    unchunked value's, so it can be shared through the near cache.
+    """
+    if any(chunk is None for chunk in chunks):
+        return None
+    data = b"".join(chunk.value for chunk in chunks)
+    if len(data) != manifest.size or zlib.crc32(data) != manifest.crc:
+        return None
+    return Item(data, manifest.flags)
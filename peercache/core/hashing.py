@@ -1,29 +1,421 @@
 import hashlib
 import bisect
-from typing import List, Dict
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:  # NumPy is only needed for the batch APIs.
+    import numpy as np
 
 
 def _h32(data: str) -> int:
     """Return a 32-bit *stable* hash for the given string."""
-    return int(hashlib.md5(data.encode()).hexdigest()[:8], 16)
+    # Same value as int(md5(...).hexdigest()[:8], 16), without the hex round trip.
+    return int.from_bytes(hashlib.md5(data.encode()).digest()[:4], "big")
+
+
+def _crc32(data: str) -> int:
+    """Return the CRC-32 of the given string (fast, not placement-compatible)."""
+    return zlib.crc32(data.encode())
+
+
+def _blake2b32(data: str) -> int:
+    """Return a 32-bit BLAKE2b digest of the given string."""
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=4).digest(), "big")
+
+
+# Named hash functions a ring (and its network JSON) can select. "md5" keeps
+# placement identical to earlier releases.
+HASH_FUNCTIONS: Dict[str, Callable[[str], int]] = {
+    "md5": _h32,
+    "crc32": _crc32,
+    "blake2b": _blake2b32,
+}
+
+# Upper bound on the precomputed replica preference table (bytes).
+MAX_TABLE_BYTES = 64 * 1024 * 1024
+
+_SPACE = 1 << 32
+
+# (start, end, old_owner, new_owner): keys hashing into [start, end) changed
+# primary owner. The range wraps past 2**32 when start > end; start == end is
+# the whole keyspace. A None owner means the ring was (or became) empty.
+RangeMove = Tuple[int, int, Optional[str], Optional[str]]
+
+
+# Evenly spaced key hashes at which ``sampled_moves`` compares placements.
+_SAMPLES = 1 << 16
+
 
+def resolve_hash(
+    hash_fn: Union[str, Callable[[str], int]]
+) -> Callable[[str], int]:
+    """Return the hash function registered as *hash_fn* (or *hash_fn* itself)."""
+    if not isinstance(hash_fn, str):
+        return hash_fn
+    if hash_fn not in HASH_FUNCTIONS:
+        raise ValueError(f"Unknown hash function '{hash_fn}'")
+    return HASH_FUNCTIONS[hash_fn]
 
-class ConsistentHashRing:
+
+def moved_fraction(moves: List[RangeMove]) -> float:
+    """Return the fraction of the 32-bit keyspace covered by *moves*."""
+    return sum(((end - start) % _SPACE) or _SPACE for start, end, _, _ in moves) / _SPACE
+
+
+def merge_moves(moves: List[RangeMove]) -> List[RangeMove]:
+    """Coalesce adjacent ranges that share both old and new owner."""
+    merged: List[RangeMove] = []
+    for start, end, old, new in moves:
+        if merged:
+            p_start, p_end, p_old, p_new = merged[-1]
+            if p_end == start and p_old == old and p_new == new:
+                merged[-1] = (p_start, end, old, new)
+                continue
+        merged.append((start, end, old, new))
+    return merged
+
+
+def sampled_moves(old, new) -> List[RangeMove]:
+    """
+    Compare the primary owners of two placements (of any kind) at 2**16
+    evenly spaced key hashes. Each sample whose owner changed stands for its
+    1/65536 of the keyspace, so ``moved_fraction`` is exact to that
+    resolution; the ranges themselves are only as precise as the grid.
+    """
+    import numpy as np
+
+    step = _SPACE // _SAMPLES
+    hashes = np.arange(_SAMPLES, dtype=np.uint64) * step + step // 2
+    before, after = _primary_names(old, hashes), _primary_names(new, hashes)
+    moves = [
+        (i * step, (i + 1) * step % _SPACE, before[i], after[i])
+        for i in np.flatnonzero(before != after).tolist()
+    ]
+    return merge_moves(moves)
+
+
+def _primary_names(placement, hashes: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    if not placement.peers:
+        return np.full(len(hashes), None, dtype=object)
+    names = np.array(placement.peers, dtype=object)
+    return names[placement.owners_of_hashes(hashes, 1)]
+
+
+class Placement(ABC):
+    """
+    What ``Network`` needs from a key placement: the vnode ring below and
+    every strategy in ``peercache.core.placement`` implement it.
+
+    Besides lookups, a placement reports the ranges a membership change
+    moved, decides which peer list is left when one is removed (``without``)
+    and describes how it honours a peer's weight (``share``).
+    """
+
+    peers: List[str]
+    weights: Dict[str, float]
+
+    # What ``len()`` counts, for display.
+    unit = "peers"
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Size of the lookup state, in ``unit``."""
+
+    @abstractmethod
+    def get_n(self, key: str, n: int = 1) -> List[str]:
+        """Return up to *n* distinct peer_ids responsible for *key*."""
+
+    @abstractmethod
+    def owners_of_hashes(self, hashes: "np.ndarray", n: int = 1) -> "np.ndarray":
+        """``get_n_batch`` for keys that are already hashed (uint64 array)."""
+
+    @abstractmethod
+    def add_peer(self, peer_id: str, weight: Optional[float] = None) -> List[RangeMove]:
+        """Add one peer and return the ranges it took over."""
+
+    @abstractmethod
+    def remove_peer(self, peer_id: str) -> List[RangeMove]:
+        """Drop one peer and return the ranges it handed off."""
+
+    @abstractmethod
+    def memory_usage(self) -> Dict[str, int]:
+        """Return the bytes held by the lookup state (``total`` included)."""
+
+    def diff(self, other: "Placement") -> List[RangeMove]:
+        """Return the (sampled) ranges whose primary owner differs on *other*."""
+        return sampled_moves(self, other)
+
+    @staticmethod
+    def without(peers: List[str], peer_id: str) -> List[str]:
+        """Return the peer list left once *peer_id* is removed."""
+        return [pid for pid in peers if pid != peer_id]
+
+    def weight_of(self, peer_id: str) -> float:
+        return self.weights.get(peer_id, 1.0)
+
+    def share(self, peer_id: str) -> str:
+        """How the placement honours *peer_id*'s weight, for messages."""
+        return f"weight {self.weight_of(peer_id):.2f}x"
+
+    def get_bounded(
+        self, key: str, n: int, loads: Dict[str, int], cap: float
+    ) -> List[str]:
+        """
+        The first *n* owners in preference order whose load is below *cap*;
+        owners at or over it are only used when too few are left.
+        """
+        picked: List[str] = []
+        full: List[str] = []
+        for pid in self.get_n(key, len(self.peers)):
+            if len(picked) == n:
+                break
+            (picked if loads.get(pid, 0) < cap else full).append(pid)
+        return picked + full[: n - len(picked)]
+
+    def get_n_batch(self, keys: Iterable[str], n: int = 1) -> "np.ndarray":
+        """
+        Return owner indices (into ``self.peers``) for many keys at once.
+
+        Keys are hashed in one pass and handed to ``owners_of_hashes``. The
+        result has shape ``(len(keys),)`` for ``n == 1`` and ``(len(keys), n)``
+        otherwise, truncated to the distinct peers.
+        """
+        import numpy as np
+
+        return self.owners_of_hashes(np.fromiter(map(self.hash, keys), np.uint64), n)
+
+    def load_histogram(self, keys: Iterable[str], n: int = 1) -> Dict[str, int]:
+        """Return how many of *keys* (times replicas) land on each peer."""
+        import numpy as np
+
+        owners = self.get_n_batch(keys, n)
+        counts = np.bincount(owners.ravel(), minlength=len(self.peers))
+        return {pid: int(c) for pid, c in zip(self.peers, counts)}
+
+
+class ConsistentHashRing(Placement):
     """
     Consistent-hash ring with V virtual nodes per peer.
+
+    Ring points live in a sorted ``array('I')`` with a parallel array of
+    indices into ``self.peers``, so a lookup is one bisect over machine ints.
+    For ``replicas`` > 1 the ordered distinct owners of every ring segment
+    are precomputed, turning ``get_n`` into a bisect plus a slice.
+
+    ``weights`` scales a peer's vnode count (``round(V × weight)``, at least
+    one); peers without a weight get V.
     """
 
-    def __init__(self, peer_ids: List[str], virtual_nodes: int = 100) -> None:
-        self.vnodes: Dict[int, str] = {}
-        self.ring: List[int] = []
+    def __init__(
+        self,
+        peer_ids: List[str],
+        virtual_nodes: int = 100,
+        hash_fn: Union[str, Callable[[str], int]] = "md5",
+        replicas: int = 1,
+        max_table_bytes: int = MAX_TABLE_BYTES,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.hash: Callable[[str], int] = resolve_hash(hash_fn)
+        self.virtual_nodes = virtual_nodes
+        self.weights: Dict[str, float] = dict(weights or {})
+        self.peers: List[str] = sorted(set(peer_ids))
+
+        placed: Dict[int, int] = {}
+        for idx, pid in enumerate(self.peers):
+            for v in range(self.vnodes_for(pid)):
+                # On a (rare) 32-bit collision the first peer keeps the point.
+                placed.setdefault(self.hash(f"{pid}#{v}"), idx)
+
+        ordered = sorted(placed)
+        self.points = array("I", ordered)
+        self.owners = array("I", (placed[h] for h in ordered))
+        self.distinct = len(set(self.owners))
+
+        self.replicas = replicas
+        self.max_table_bytes = max_table_bytes
+        self.width = 0
+        self.prefs: Optional[array] = None
+        self._build_prefs()
+
+    unit = "points"
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def vnodes_for(self, peer_id: str) -> int:
+        """Number of virtual nodes *peer_id* gets under its weight."""
+        weight = self.weights.get(peer_id)
+        if weight is None:
+            return self.virtual_nodes
+        return max(1, round(self.virtual_nodes * weight))
+
+    def share(self, peer_id: str) -> str:
+        return f"{self.vnodes_for(peer_id)} vnodes"
+
+    # ------------------------------------------------------------------ #
+    # Incremental membership
+    # ------------------------------------------------------------------ #
+    def add_peer(
+        self,
+        peer_id: str,
+        weight: Optional[float] = None,
+        virtual_nodes: Optional[int] = None,
+    ) -> List[RangeMove]:
+        """
+        Insert one peer's vnodes in place and return the ranges it took over.
+
+        Only the new peer's vnodes are hashed; existing points keep their
+        owners (a colliding point stays with its current owner).
+        """
+        if peer_id in self.peers:
+            return []
+        if weight is not None:
+            self.weights[peer_id] = weight
+        vn = self.vnodes_for(peer_id) if virtual_nodes is None else virtual_nodes
+        existing = set(self.points)
+        fresh = sorted({self.hash(f"{peer_id}#{v}") for v in range(vn)} - existing)
+        if not fresh:
+            return []
+
+        new_idx = len(self.peers)
+        self.peers.append(peer_id)
+        old_points, old_owners = array("I", self.points), self.owners[:]
+        old_size = len(old_points)
+        for h in fresh:
+            pos = bisect.bisect(self.points, h)
+            self.points.insert(pos, h)
+            self.owners.insert(pos, new_idx)
+        if not old_size:
+            self._after_membership_change()
+            return [(fresh[0], fresh[0], None, peer_id)]
+
+        # Ranges come from the final ring, so each one ends at a fresh point
+        # and starts at its predecessor there: they never overlap, even
+        # across the wrap-around.
+        moves: List[RangeMove] = []
+        for h in fresh:
+            # Keys in [pred, h) used to belong to h's successor on the old ring.
+            pred = self.points[bisect.bisect_left(self.points, h) - 1]
+            succ = bisect.bisect(old_points, h) % old_size
+            moves.append((pred, h, self.peers[old_owners[succ]], peer_id))
+
+        self._after_membership_change()
+        return merge_moves(moves)
+
+    def remove_peer(self, peer_id: str) -> List[RangeMove]:
+        """
+        Drop one peer's vnodes in place and return the ranges it handed off.
+        """
+        if peer_id not in self.peers:
+            return []
+        self.weights.pop(peer_id, None)
+        gone = self.peers.index(peer_id)
+        points, owners = self.points, self.owners
+        size = len(points)
+
+        moves: List[RangeMove] = []
+        for i in range(size):
+            if owners[i] != gone:
+                continue
+            j = (i + 1) % size
+            while owners[j] == gone and j != i:
+                j = (j + 1) % size
+            new = None if owners[j] == gone else self.peers[owners[j]]
+            moves.append((points[i - 1], points[i], peer_id, new))
+
+        keep = [i for i in range(size) if owners[i] != gone]
+        self.points = array("I", (points[i] for i in keep))
+        self.owners = array("I", (owners[i] - (owners[i] > gone) for i in keep))
+        self.peers.pop(gone)
+
+        self._after_membership_change()
+        return merge_moves(moves)
+
+    def diff(self, other) -> List[RangeMove]:
+        """
+        Return the ranges whose primary owner differs on *other*, e.g. after
+        a rebuild with new weights. Against another kind of placement the
+        ranges are sampled (see ``sampled_moves``).
+        """
+        if not isinstance(other, ConsistentHashRing):
+            return sampled_moves(self, other)
+        if not len(self.points) or not len(other.points):
+            old = self.peers[self.owners[0]] if len(self.points) else None
+            new = other.peers[other.owners[0]] if len(other.points) else None
+            return [] if old == new else [(0, 0, old, new)]
+
+        bounds = sorted(set(self.points).union(other.points))
+        moves: List[RangeMove] = []
+        for i, end in enumerate(bounds):
+            # Keys in [previous bound, end) go to the first point >= end.
+            old = self._owner_at(end)
+            new = other._owner_at(end)
+            if old != new:
+                moves.append((bounds[i - 1], end, old, new))
+        return merge_moves(moves)
+
+    def _owner_at(self, point: int) -> str:
+        idx = bisect.bisect_left(self.points, point)
+        return self.peers[self.owners[idx % len(self.points)]]
+
+    def _after_membership_change(self) -> None:
+        self.distinct = len(set(self.owners))
+        self._build_prefs()
+
+    def _build_prefs(self) -> None:
+        """
+        Precompute, for every segment, its first ``width`` distinct owners.
+
+        Skipped (lookups walk the ring instead) when replication is 1 or the
+        table would exceed ``max_table_bytes``.
+        """
+        width = min(self.replicas, self.distinct)
+        size = len(self.points)
+        itemsize = self.owners.itemsize
+        if width <= 1 or size * width * itemsize > self.max_table_bytes:
+            self.width, self.prefs = 0, None
+            return
 
-        for pid in set(peer_ids):
-            for v in range(virtual_nodes):
-                h = _h32(f"{pid}#{v}")
-                self.vnodes[h] = pid
-                self.ring.append(h)
+        owners = self.owners
+        prefs = array("I", bytes(size * width * itemsize))
+        for start in range(size):
+            base = start * width
+            filled = 0
+            idx = start
+            while filled < width:
+                owner = owners[idx]
+                if owner not in prefs[base : base + filled]:
+                    prefs[base + filled] = owner
+                    filled += 1
+                idx += 1
+                if idx == size:
+                    idx = 0
+        self.width, self.prefs = width, prefs
 
-        self.ring.sort()
+    def memory_usage(self) -> Dict[str, int]:
+        """Return the bytes held by the ring arrays and the preference table."""
+        points = self.points.itemsize * len(self.points)
+        owners = self.owners.itemsize * len(self.owners)
+        prefs = self.prefs.itemsize * len(self.prefs) if self.prefs is not None else 0
+        return {
+            "points": points,
+            "owners": owners,
+            "prefs": prefs,
+            "total": points + owners + prefs,
+        }
 
     def get_n(self, key: str, n: int = 1) -> List[str]:
         """
@@ -32,21 +424,98 @@ class ConsistentHashRing:
         If the requested replication factor exceeds the number of peers on the
         ring, the list is truncated to the available peers.
         """
-        if not self.ring:
+        size = len(self.points)
+        if not size:
             return list()
 
+        idx = bisect.bisect(self.points, self.hash(key))
+        if idx == size:
+            idx = 0
+        if n <= 1:
+            return [self.peers[self.owners[idx]]]
+
         # Prevent infinite loop if n > unique peers
-        max_distinct = len(set(self.vnodes.values()))
-        n = max(1, min(n, max_distinct))
+        n = min(n, self.distinct)
+        if n <= self.width:
+            base = idx * self.width
+            return [self.peers[i] for i in self.prefs[base : base + n]]
 
-        h = _h32(key)
-        idx = bisect.bisect(self.ring, h)
+        return [self.peers[i] for i in self._walk(idx, n)]
 
-        result: List[str] = []
-        while len(result) < n:
-            pid = self.vnodes[self.ring[idx % len(self.ring)]]
-            if pid not in result:
-                result.append(pid)
+    def get_bounded(
+        self, key: str, n: int, loads: Dict[str, int], cap: float
+    ) -> List[str]:
+        """
+        Consistent hashing with bounded loads: the first *n* distinct owners
+        in ring order whose load is below *cap*. Owners at or over the cap
+        are skipped and only used, in ring order, when too few are left.
+        """
+        size = len(self.points)
+        if not size:
+            return []
+        n = min(n, self.distinct)
+        idx = bisect.bisect(self.points, self.hash(key))
+        owners = self.owners
+        picked: List[str] = []
+        full: List[str] = []
+        seen = set()
+        while len(picked) < n and len(seen) < self.distinct:
+            if idx >= size:
+                idx = 0
+            owner = owners[idx]
+            if owner not in seen:
+                seen.add(owner)
+                pid = self.peers[owner]
+                (picked if loads.get(pid, 0) < cap else full).append(pid)
             idx += 1
+        return picked + full[: n - len(picked)]
+
+    # ------------------------------------------------------------------ #
+    # Bulk placement (NumPy)
+    # ------------------------------------------------------------------ #
+    def owners_of_hashes(self, hashes: "np.ndarray", n: int = 1) -> "np.ndarray":
+        """
+        Owner indices for already-hashed keys, placed with ``np.searchsorted``
+        over the ring points.
+        """
+        import numpy as np
+
+        dtype = np.dtype(f"u{self.points.itemsize}")
+        if not len(self.points):
+            return np.empty((len(hashes),) if n <= 1 else (len(hashes), 0), dtype)
+
+        points = np.frombuffer(self.points, dtype=dtype)
+        owners = np.frombuffer(self.owners, dtype=dtype)
+        idx = np.searchsorted(points, hashes, side="right")
+        idx[idx == len(points)] = 0
+        if n <= 1:
+            return owners[idx]
 
-        return result
+        n = min(n, self.distinct)
+        if n <= self.width:
+            prefs = np.frombuffer(self.prefs, dtype=dtype).reshape(-1, self.width)
+            return prefs[idx, :n]
+
+        # No table wide enough: walk the ring per distinct segment only.
+        out = np.empty((len(idx), n), dtype)
+        walked: Dict[int, List[int]] = {}
+        for row, start in enumerate(idx.tolist()):
+            chain = walked.get(start)
+            if chain is None:
+                chain = walked[start] = self._walk(start, n)
+            out[row] = chain
+        return out
+
+    def _walk(self, idx: int, n: int) -> List[int]:
+        """Return the first *n* distinct owner indices from point *idx* on."""
+        owners = self.owners
+        size = len(owners)
+        seen: List[int] = []
+        while len(seen) < n:
+            owner = owners[idx]
+            if owner not in seen:
+                seen.append(owner)
+            idx += 1
+            if idx == size:
+                idx = 0
+        return seen
@@ -0,0 +1,101 @@
+import math
+from array import array
+from typing import List, Sequence, Tuple
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory, log-bucketed latency histogram (HDR-style).
+
+    Bucket ``i`` covers ``[growth**(i-1), growth**i)`` so every reported value
+    is within ``precision`` of the true one; values below 1 share bucket 0 and
+    values above ``max_value`` share the last bucket (``max`` stays exact).
+    Histograms with the same layout can be merged, e.g. across workers.
+    """
+
+    def __init__(
+        self, max_value: float = 60_000_000.0, precision: float = 0.01
+    ) -> None:
+        self.max_value = max_value
+        self.precision = precision
+        self.growth = 1.0 + precision
+        self._scale = 1.0 / math.log(self.growth)
+        self.size = int(math.log(max_value) * self._scale) + 2
+        self.counts = array("Q", bytes(8 * self.size))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value < 1.0:
+            return 0
+        return min(int(math.log(value) * self._scale) + 1, self.size - 1)
+
+    def _value(self, index: int) -> float:
+        """Upper edge of bucket *index*, never above the largest sample."""
+        if index == self.size - 1:
+            return self.max
+        return min(0.0 if index == 0 else self.growth**index, self.max)
+
+    def record(self, value: float, count: int = 1) -> None:
+        self.counts[self._index(value)] += count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add *other*'s samples into this histogram and return it."""
+        if (other.size, other.precision) != (self.size, self.precision):
+            raise ValueError("Cannot merge histograms with different layouts")
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Smallest bucket value with at least *q* % of samples at or below it."""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self._value(i)
+        return self.max
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """Samples at or below each of the ascending *bounds* (± precision)."""
+        out: List[int] = []
+        seen = 0
+        i = 0
+        for bound in bounds:
+            last = self._index(bound)
+            while i <= last:
+                seen += self.counts[i]
+                i += 1
+            out.append(seen)
+        return out
+
+    def cdf(self) -> List[Tuple[float, float]]:
+        """``(value, percentile)`` points for every non-empty bucket."""
+        points: List[Tuple[float, float]] = []
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                points.append((self._value(i), seen / self.count * 100))
+        return points
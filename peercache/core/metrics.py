@@ -0,0 +1,180 @@
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from peercache.core.histogram import LatencyHistogram
+
+Labels = Tuple[Tuple[str, str], ...]
+Gauge = Tuple[str, Labels, float]
+
+# Prometheus bucket bounds (seconds) rendered from the log-bucketed histograms.
+BUCKETS = (0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025)
+BUCKETS += (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+_BUCKETS_US = [b * 1e6 for b in BUCKETS]
+
+
+class Metrics:
+    """
+    Process-wide counters and phase latency histograms.
+
+    Phases are recorded in nanoseconds into fixed-memory ``LatencyHistogram``s
+    (µs buckets, 1 % precision) keyed by metric name and label set, so a
+    sample costs a dict lookup, a log and a short lock. ``render()`` produces
+    the Prometheus text exposition format.
+
+    An optional profiler hook receives a per-request trace (op, key and every
+    phase with its peer) for a random ``sample_rate`` fraction of requests.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], int] = {}
+        self._hists: Dict[Tuple[str, Labels], LatencyHistogram] = {}
+        self._collectors: List[Callable[[], List[Gauge]]] = []
+        self._hook: Optional[Callable[[Dict], None]] = None
+        self._sample_rate = 0.0
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------ #
+    # Recording
+    # ------------------------------------------------------------------ #
+    def inc(self, name: str, labels: Labels = (), value: int = 1) -> None:
+        if not self.enabled:
+            return
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, phase: str, op: str, ns: int, peer: Optional[str] = None) -> None:
+        """Record *ns* spent in *phase* of *op* (optionally on one *peer*)."""
+        if not self.enabled:
+            return
+        labels: Labels = (("op", op), ("phase", phase))
+        if peer is not None:
+            labels += (("peer", peer),)
+        key = ("peercache_phase_seconds", labels)
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = LatencyHistogram()
+            hist.record(ns / 1000)
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace["phases"].append((phase, peer, ns / 1000))
+
+    def add_collector(self, fn: Callable[[], List[Gauge]]) -> None:
+        """Register a callback returning ``(name, labels, value)`` gauges."""
+        self._collectors.append(fn)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._hists.clear()
+
+    # ------------------------------------------------------------------ #
+    # Sampling profiler
+    # ------------------------------------------------------------------ #
+    def set_profiler(
+        self, hook: Optional[Callable[[Dict], None]], sample_rate: float = 0.01
+    ) -> None:
+        """Call *hook* with the phase trace of ~``sample_rate`` of requests."""
+        self._hook = hook
+        self._sample_rate = sample_rate if hook is not None else 0.0
+
+    def start_trace(self, op: str, key: str) -> Optional[Dict]:
+        if not self._sample_rate or random.random() >= self._sample_rate:
+            return None
+        trace = {"op": op, "key": key, "phases": [], "start": time.perf_counter_ns()}
+        self._local.trace = trace
+        return trace
+
+    def end_trace(self, trace: Optional[Dict]) -> None:
+        if trace is None:
+            return
+        self._local.trace = None
+        trace["total_us"] = (time.perf_counter_ns() - trace.pop("start")) / 1000
+        hook = self._hook
+        if hook is not None:
+            hook(trace)
+
+    # ------------------------------------------------------------------ #
+    # Exposition
+    # ------------------------------------------------------------------ #
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            hists = [
+                (key, hist.cumulative(_BUCKETS_US), hist.count, hist.total)
+                for key, hist in sorted(self._hists.items())
+            ]
+
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_fmt(labels)} {value}")
+
+        for (name, labels), cumulative, count, total_us in hists:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, seen in zip(BUCKETS, cumulative):
+                le = labels + (("le", repr(bound)),)
+                lines.append(f"{name}_bucket{_fmt(le)} {seen}")
+            inf = labels + (("le", "+Inf"),)
+            lines.append(f"{name}_bucket{_fmt(inf)} {count}")
+            lines.append(f"{name}_sum{_fmt(labels)} {total_us / 1e6:.9f}")
+            lines.append(f"{name}_count{_fmt(labels)} {count}")
+
+        gauges = sorted(g for collect in self._collectors for g in collect())
+        for name, labels, value in gauges:
+            if name not in typed:
+                lines.append(f"# TYPE {name} gauge")
+                typed.add(name)
+            lines.append(f"{name}{_fmt(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` from a daemon thread; returns the server."""
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(
+            target=server.serve_forever, name="peercache-metrics", daemon=True
+        ).start()
+        return server
+
+
+def _fmt(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
@@ -0,0 +1,418 @@
+import hashlib
+import heapq
+import math
+from abc import abstractmethod
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+from peercache.core.hashing import (
+    ConsistentHashRing,
+    Placement,
+    RangeMove,
+    resolve_hash,
+    sampled_moves,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_MASK64 = (1 << 64) - 1
+_UNIT = float(1 << 53)
+
+# Jump hash's 64-bit LCG multiplier.
+_JUMP_MUL = 2862933555777941143
+
+# Default Maglev table size: prime, and ≥ 100 slots per peer up to 655 peers.
+MAGLEV_TABLE_SIZE = 65537
+
+
+def _seed64(text: str) -> int:
+    """Return a stable 64-bit seed for a peer id."""
+    return int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "big")
+
+
+def _mix64(z: int) -> int:
+    """SplitMix64 finaliser: a cheap, well-mixed 64-bit permutation."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _mix64_np(z: "np.ndarray") -> "np.ndarray":
+    """``_mix64`` over a uint64 array (multiplications wrap like the mask)."""
+    import numpy as np
+
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _jump(key: int, buckets: int) -> int:
+    """Jump consistent hash of *key* into ``range(buckets)``."""
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * _JUMP_MUL + 1) & _MASK64
+        j = int((b + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return b
+
+
+class _HashPlacement(Placement):
+    """
+    Shared plumbing for placements computed from a key's 32-bit hash.
+
+    Subclasses build their lookup state in ``_build`` (called again after
+    every membership change), return owner indices for one hash from
+    ``_owners`` and for a uint64 array of hashes from ``owners_of_hashes``.
+    ``add_peer``/``remove_peer`` rebuild and report the moved ranges sampled
+    by ``sampled_moves``.
+    """
+
+    def __init__(
+        self,
+        peer_ids: List[str],
+        hash_fn: Union[str, Callable[[str], int]] = "md5",
+        replicas: int = 1,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.hash: Callable[[str], int] = resolve_hash(hash_fn)
+        self.replicas = replicas
+        self.weights: Dict[str, float] = dict(weights or {})
+        self.peers: List[str] = self._arrange(peer_ids)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.peers)
+
+    @property
+    def distinct(self) -> int:
+        return len(self.peers)
+
+    @staticmethod
+    def _arrange(peer_ids: Iterable[str]) -> List[str]:
+        """Index order of the peers; placement must not depend on input order."""
+        return sorted(set(peer_ids))
+
+    @abstractmethod
+    def _build(self) -> None:
+        """(Re)build the lookup state for ``self.peers``."""
+
+    @abstractmethod
+    def _owners(self, h: int, n: int) -> List[int]:
+        """Return *n* distinct owner indices for the key hash *h*."""
+
+    # ------------------------------------------------------------------ #
+    # Membership
+    # ------------------------------------------------------------------ #
+    def add_peer(self, peer_id: str, weight: Optional[float] = None) -> List[RangeMove]:
+        """Add one peer, rebuild, and return the (sampled) ranges it took over."""
+        if peer_id in self.peers:
+            return []
+        old = self._copy()
+        if weight is not None:
+            self.weights = {**self.weights, peer_id: weight}
+        self.peers = self._arrange(self.peers + [peer_id])
+        self._build()
+        return sampled_moves(old, self)
+
+    def remove_peer(self, peer_id: str) -> List[RangeMove]:
+        """Drop one peer, rebuild, and return the (sampled) ranges it handed off."""
+        if peer_id not in self.peers:
+            return []
+        old = self._copy()
+        self.weights = {pid: w for pid, w in self.weights.items() if pid != peer_id}
+        self.peers = self.without(self.peers, peer_id)
+        self._build()
+        return sampled_moves(old, self)
+
+    def _copy(self) -> "_HashPlacement":
+        # Membership changes rebind (never mutate) peers, weights and tables,
+        # so a shallow copy keeps the old placement intact.
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    # ------------------------------------------------------------------ #
+    # Lookups
+    # ------------------------------------------------------------------ #
+    def get_n(self, key: str, n: int = 1) -> List[str]:
+        """Return up to *n* distinct peer_ids responsible for *key*."""
+        if not self.peers:
+            return []
+        n = max(1, min(n, len(self.peers)))
+        return [self.peers[i] for i in self._owners(self.hash(key), n)]
+
+    def _empty(self, hashes: "np.ndarray", n: int) -> "np.ndarray":
+        import numpy as np
+
+        return np.empty((len(hashes),) if n <= 1 else (len(hashes), 0), np.intp)
+
+
+class RendezvousPlacement(_HashPlacement):
+    """
+    Weighted rendezvous (highest-random-weight) hashing.
+
+    Every peer scores a key with a seeded 64-bit mix of the key hash and the
+    *n* best scores own it. Unequal weights score ``-w / ln(u)``, ``u`` being
+    the mix mapped into (0, 1), which gives each peer a share proportional
+    to its weight. The only state is one seed per peer. A lookup costs one
+    mix per peer. A membership change moves just the keys whose best score
+    belongs to the changed peer.
+    """
+
+    unit = "seeds"
+
+    def _build(self) -> None:
+        self.seeds = array("Q", (_seed64(pid) for pid in self.peers))
+        scale = array("d", (self.weight_of(pid) for pid in self.peers))
+        # Equal weights rank by the raw mix: same order, no logarithm.
+        self.scale = scale if len(set(scale)) > 1 else None
+
+    def _scores(self, h: int) -> List[float]:
+        if self.scale is None:
+            return [_mix64(h ^ s) for s in self.seeds]
+        log = math.log
+        return [
+            -w / log(((_mix64(h ^ s) >> 11) + 0.5) / _UNIT)
+            for s, w in zip(self.seeds, self.scale)
+        ]
+
+    def _owners(self, h: int, n: int) -> List[int]:
+        scores = self._scores(h)
+        if n == 1:
+            return [max(range(len(scores)), key=scores.__getitem__)]
+        return heapq.nlargest(n, range(len(scores)), key=scores.__getitem__)
+
+    def owners_of_hashes(self, hashes: "np.ndarray", n: int = 1) -> "np.ndarray":
+        import numpy as np
+
+        if not self.peers:
+            return self._empty(hashes, n)
+        seeds = np.frombuffer(self.seeds, dtype=np.uint64)
+        scores = _mix64_np(hashes.astype(np.uint64)[:, None] ^ seeds)
+        if self.scale is not None:
+            u = ((scores >> np.uint64(11)).astype(np.float64) + 0.5) / _UNIT
+            scores = -np.frombuffer(self.scale, dtype=np.float64) / np.log(u)
+        if n <= 1:
+            return np.argmax(scores, axis=1)
+        n = min(n, len(self.peers))
+        return np.argsort(scores, axis=1)[:, ::-1][:, :n]
+
+    def memory_usage(self) -> Dict[str, int]:
+        seeds = self.seeds.itemsize * len(self.seeds)
+        scale = self.scale.itemsize * len(self.scale) if self.scale is not None else 0
+        return {"seeds": seeds, "weights": scale, "total": seeds + scale}
+
+
+class JumpHashPlacement(_HashPlacement):
+    """
+    Jump consistent hash (Lamping & Veach, 2014).
+
+    The bucket comes from the key hash alone, in O(ln peers) steps, with no
+    table. Buckets are positions in ``peers``, which keeps insertion order.
+    An added peer takes an equal 1/(P+1) slice from every other peer. A
+    removed peer's bucket goes to the last peer (see ``without``), so about
+    2/P of the keys move. Replicas are the buckets after the primary.
+    Weights are ignored: every peer gets an equal share.
+    """
+
+    @staticmethod
+    def _arrange(peer_ids: Iterable[str]) -> List[str]:
+        return list(dict.fromkeys(peer_ids))
+
+    @staticmethod
+    def without(peers: List[str], peer_id: str) -> List[str]:
+        """Return *peers* minus *peer_id*, the last peer moving into its bucket."""
+        out = list(peers)
+        out[out.index(peer_id)] = out[-1]
+        out.pop()
+        return out
+
+    def share(self, peer_id: str) -> str:
+        return "ignored by jump placement"
+
+    unit = "buckets"
+
+    def _build(self) -> None:
+        pass
+
+    def _owners(self, h: int, n: int) -> List[int]:
+        size = len(self.peers)
+        first = _jump(h, size)
+        return [(first + i) % size for i in range(n)]
+
+    def owners_of_hashes(self, hashes: "np.ndarray", n: int = 1) -> "np.ndarray":
+        import numpy as np
+
+        size = len(self.peers)
+        if not size:
+            return self._empty(hashes, n)
+        key = hashes.astype(np.uint64)
+        bucket = np.zeros(len(key), np.int64)
+        nxt = np.zeros(len(key), np.int64)
+        live = np.arange(len(key))
+        while len(live):
+            bucket[live] = nxt[live]
+            key[live] = key[live] * np.uint64(_JUMP_MUL) + np.uint64(1)
+            step = float(1 << 31) / ((key[live] >> np.uint64(33)) + 1.0)
+            nxt[live] = ((bucket[live] + 1) * step).astype(np.int64)
+            live = live[nxt[live] < size]
+        if n <= 1:
+            return bucket
+        n = min(n, size)
+        return (bucket[:, None] + np.arange(n)) % size
+
+    def memory_usage(self) -> Dict[str, int]:
+        return {"total": 0}
+
+
+class MaglevPlacement(_HashPlacement):
+    """
+    Maglev lookup table (Eisenbud et al., NSDI 2016).
+
+    Each peer walks its own permutation of a prime ``table_size`` slots.
+    Peers take turns claiming their next free slot, so shares are nearly
+    equal. With weights, a peer claims on a turn only once its accumulated
+    weight reaches the heaviest peer's, so its share follows its weight.
+    A key's primary is the slot at ``hash × size >> 32``: one multiply and
+    one index. Replicas are the next distinct owners along the table. A
+    rebuild moves slightly more than the ideal share of keys.
+    """
+
+    def __init__(
+        self,
+        peer_ids: List[str],
+        hash_fn: Union[str, Callable[[str], int]] = "md5",
+        replicas: int = 1,
+        weights: Optional[Dict[str, float]] = None,
+        table_size: int = MAGLEV_TABLE_SIZE,
+    ) -> None:
+        self.table_size = table_size
+        super().__init__(peer_ids, hash_fn, replicas, weights)
+
+    unit = "slots"
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _build(self) -> None:
+        size = self.table_size
+        count = len(self.peers)
+        typecode = "B" if count <= 0xFF else "H" if count <= 0xFFFF else "I"
+        if not count:
+            self.table = array(typecode)
+            return
+        table = array(typecode, bytes(size * array(typecode).itemsize))
+        pos, skip = [], []
+        for pid in self.peers:
+            digest = hashlib.md5(pid.encode()).digest()
+            pos.append(int.from_bytes(digest[:8], "big") % size)
+            skip.append(int.from_bytes(digest[8:], "big") % (size - 1) + 1)
+        top = max(self.weight_of(pid) for pid in self.peers)
+        rate = [self.weight_of(pid) / top for pid in self.peers]
+        credit = [0.0] * count
+        taken = bytearray(size)
+        filled = 0
+        while filled < size:
+            for i in range(count):
+                credit[i] += rate[i]
+                if credit[i] < 1.0:
+                    continue
+                credit[i] -= 1.0
+                c, s = pos[i], skip[i]
+                while taken[c]:
+                    c += s
+                    if c >= size:
+                        c -= size
+                taken[c] = 1
+                table[c] = i
+                c += s
+                pos[i] = c - size if c >= size else c
+                filled += 1
+                if filled == size:
+                    break
+        self.table = table
+
+    def get_n(self, key: str, n: int = 1) -> List[str]:
+        table = self.table
+        if not table:
+            return []
+        idx = (self.hash(key) * len(table)) >> 32
+        if n <= 1:
+            return [self.peers[table[idx]]]
+        return [self.peers[i] for i in self._walk(idx, min(n, len(self.peers)))]
+
+    def _owners(self, h: int, n: int) -> List[int]:
+        return self._walk((h * len(self.table)) >> 32, n)
+
+    def _walk(self, idx: int, n: int) -> List[int]:
+        """Return the first *n* distinct owners from slot *idx* on."""
+        table = self.table
+        size = len(table)
+        owners = [table[idx]]
+        while len(owners) < n:
+            idx += 1
+            if idx == size:
+                idx = 0
+            if table[idx] not in owners:
+                owners.append(table[idx])
+        return owners
+
+    def owners_of_hashes(self, hashes: "np.ndarray", n: int = 1) -> "np.ndarray":
+        import numpy as np
+
+        if not self.peers:
+            return self._empty(hashes, n)
+        table = np.frombuffer(self.table, dtype=f"u{self.table.itemsize}")
+        size = len(table)
+        idx = (hashes.astype(np.uint64) * np.uint64(size)) >> np.uint64(32)
+        if n <= 1:
+            return table[idx]
+        # Walk the table once per distinct slot, not once per key.
+        n = min(n, len(self.peers))
+        slots, inverse = np.unique(idx, return_inverse=True)
+        chains = np.empty((len(slots), n), table.dtype)
+        for row, slot in enumerate(slots.tolist()):
+            chains[row] = self._walk(slot, n)
+        return chains[inverse]
+
+    def memory_usage(self) -> Dict[str, int]:
+        table = self.table.itemsize * len(self.table)
+        return {"table": table, "total": table}
+
+
+# Placements a network (and its JSON) can select. "ring" is the vnode ring
+# every network used before placements were pluggable.
+PLACEMENTS: Dict[str, Type[Placement]] = {
+    "ring": ConsistentHashRing,
+    "rendezvous": RendezvousPlacement,
+    "jump": JumpHashPlacement,
+    "maglev": MaglevPlacement,
+}
+
+
+def make_placement(
+    name: str,
+    peer_ids: List[str],
+    hash_fn: Union[str, Callable[[str], int]] = "md5",
+    replicas: int = 1,
+    weights: Optional[Dict[str, float]] = None,
+    virtual_nodes: int = 100,
+) -> Placement:
+    """Build the placement registered as *name*; ``virtual_nodes`` is ring-only."""
+    if name not in PLACEMENTS:
+        raise ValueError(f"Unknown placement '{name}'")
+    if name == "ring":
+        return ConsistentHashRing(
+            peer_ids, virtual_nodes, hash_fn=hash_fn, replicas=replicas, weights=weights
+        )
+    return PLACEMENTS[name](peer_ids, hash_fn, replicas, weights)
@@ -0,0 +1,144 @@
+import hashlib
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional, Set
+
+
+class CountMinSketch:
+    """
+    Fixed-memory frequency estimator (never under-counts).
+
+    Each key maps to one counter per row via a single BLAKE2b digest split
+    into ``depth`` 32-bit lanes.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self.table = array("I", bytes(4 * width * depth))
+
+    def _slots(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        lanes = memoryview(digest).cast("I")
+        width = self.width
+        return [row * width + lanes[row] % width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count *key* and return its new estimate."""
+        table = self.table
+        est = None
+        for slot in self._slots(key):
+            table[slot] = min(table[slot] + count, 0xFFFFFFFF)
+            est = table[slot] if est is None else min(est, table[slot])
+        return est or 0
+
+    def estimate(self, key: str) -> int:
+        return min(self.table[slot] for slot in self._slots(key))
+
+    def halve(self) -> None:
+        """Age every counter so the sketch tracks recent traffic."""
+        self.table = array("I", (c >> 1 for c in self.table))
+
+
+class TopK:
+    """The *k* keys with the highest estimates seen so far."""
+
+    def __init__(self, k: int = 32) -> None:
+        self.k = k
+        self.counts: Dict[str, int] = {}
+        self._floor = 0
+
+    def offer(self, key: str, estimate: int) -> Optional[str]:
+        """Track *key* if it ranks; return the key it displaced, if any."""
+        counts = self.counts
+        if key in counts:
+            counts[key] = estimate
+            return None
+        if len(counts) < self.k:
+            counts[key] = estimate
+            self._floor = min(self._floor, estimate) if len(counts) > 1 else estimate
+            return None
+        if estimate <= self._floor:
+            return None
+        victim = min(counts, key=counts.__getitem__)
+        if estimate <= counts[victim]:
+            self._floor = counts[victim]
+            return None
+        del counts[victim]
+        counts[key] = estimate
+        self._floor = min(counts.values())
+        return victim
+
+    def halve(self) -> None:
+        for key in self.counts:
+            self.counts[key] >>= 1
+        self._floor >>= 1
+
+
+class HotKeyTracker:
+    """
+    Flags keys whose recent access count crosses *threshold*.
+
+    A key is promoted once it sits in the top-k with an estimate at or above
+    the threshold, and demoted when it drops out of the top-k or decays below
+    half the threshold. Callbacks run outside the tracker's lock.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        k: int = 32,
+        width: int = 2048,
+        depth: int = 4,
+        decay_every: int = 100_000,
+        on_promote: Optional[Callable[[str], None]] = None,
+        on_demote: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.threshold = threshold
+        self.decay_every = decay_every
+        self.sketch = CountMinSketch(width, depth)
+        self.topk = TopK(k)
+        self.hot_keys: Set[str] = set()
+        self.on_promote = on_promote
+        self.on_demote = on_demote
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def record(self, key: str) -> bool:
+        """Count one access to *key*; return True if the key is hot."""
+        promoted: List[str] = []
+        demoted: List[str] = []
+        with self._lock:
+            est = self.sketch.add(key)
+            displaced = self.topk.offer(key, est)
+            if displaced is not None and displaced in self.hot_keys:
+                self.hot_keys.discard(displaced)
+                demoted.append(displaced)
+            if (
+                est >= self.threshold
+                and key not in self.hot_keys
+                and key in self.topk.counts
+            ):
+                self.hot_keys.add(key)
+                promoted.append(key)
+
+            self._seen += 1
+            if self._seen % self.decay_every == 0:
+                demoted.extend(self._decay())
+            hot = key in self.hot_keys
+
+        for k in promoted:
+            if self.on_promote is not None:
+                self.on_promote(k)
+        for k in demoted:
+            if self.on_demote is not None:
+                self.on_demote(k)
+        return hot
+
+    def _decay(self) -> List[str]:
+        self.sketch.halve()
+        self.topk.halve()
+        floor = self.threshold // 2
+        cold = [k for k in self.hot_keys if self.topk.counts.get(k, 0) < floor]
+        self.hot_keys.difference_update(cold)
+        return cold
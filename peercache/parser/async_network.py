@@ -0,0 +1,196 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+
+from peercache.core.codec import (
+    FLAG_BYTES,
+    FLAG_MANIFEST,
+    Item,
+    Manifest,
+    chunk_key,
+    join_chunks,
+    split_chunks,
+)
+from peercache.parser.async_peer import AsyncPeer
+from peercache.parser.network import Network
+
+
+class AsyncNetwork:
+    """
+    asyncio counterpart of ``Network``.
+
+    Loads the same ``state/network/<name>.json`` and uses the same
+    placement (``Network.ring``), but talks to each peer over one
+    pipelined ``AsyncPeer`` connection so a single event loop can keep many
+    operations in flight. ``connections`` > 1 keeps that many pipelined
+    connections per peer and spreads requests over them round-robin.
+    """
+
+    def __init__(self, name: str, timeout: float = 1.0, connections: int = 1) -> None:
+        self.network = Network(name)
+        self.name = name
+        self.timeout = timeout
+        self.connections = max(1, connections)
+        self._peers: Dict[str, List[AsyncPeer]] = {}
+        self._turn = 0
+
+    @property
+    def ring(self):
+        return self.network.ring
+
+    @property
+    def replication(self) -> int:
+        return self.network.replication
+
+    def peer(self, peer_id: str) -> AsyncPeer:
+        conns = self._peers.get(peer_id)
+        if conns is None:
+            base = self.network.peer(peer_id)
+            conns = [
+                AsyncPeer.from_peer(base, self.timeout) for _ in range(self.connections)
+            ]
+            self._peers[peer_id] = conns
+        if len(conns) == 1:
+            return conns[0]
+        self._turn += 1
+        return conns[self._turn % len(conns)]
+
+    async def reload(self) -> None:
+        """
+        Re-read the network's state file; connections to peers that left (or
+        moved to another port) are closed, the rest are kept. The file is
+        parsed off the event loop, and an unreadable one raises and leaves
+        the current placement in use.
+        """
+        self.network = await asyncio.to_thread(Network, self.name, strict=True)
+        stale = [
+            pid
+            for pid, conns in self._peers.items()
+            if pid not in self.network.peers
+            or self.network.peer(pid).port != conns[0].port
+        ]
+        await asyncio.gather(*(c.close() for pid in stale for c in self._peers[pid]))
+        for pid in stale:
+            del self._peers[pid]
+
+    async def close(self) -> None:
+        await asyncio.gather(*(c.close() for cs in self._peers.values() for c in cs))
+        self._peers.clear()
+
+    async def __aenter__(self) -> "AsyncNetwork":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------------ #
+    # Cache operations
+    # ------------------------------------------------------------------ #
+    @property
+    def codec(self):
+        return self.network.codec
+
+    async def set(self, key: str, value: Any, expire: int = 0) -> str:
+        if not self.network.peers:
+            return "No peers available."
+        item = self.codec.encode(value)
+        chunk_size = self.network.chunk_size
+        if chunk_size and len(item.value) > chunk_size:
+            # The manifest is written only after all of its chunks are stored.
+            manifest, chunks = split_chunks(item, chunk_size)
+            writes = []
+            for i, chunk in enumerate(chunks):
+                ckey = chunk_key(key, i)
+                for pid in self.ring.get_n(ckey, self.replication):
+                    chunk_item = Item(chunk, FLAG_BYTES)
+                    writes.append(self.peer(pid).set(ckey, chunk_item, expire))
+            if not all(await asyncio.gather(*writes)):
+                return f"SET {key} failed: chunks not stored"
+            item = manifest.to_item()
+        targets = self.ring.get_n(key, self.replication)
+        await asyncio.gather(
+            *(self.peer(pid).set(key, item, expire) for pid in targets)
+        )
+        return f"SET {key} replicated to {targets}"
+
+    async def get(self, key: str) -> Any:
+        if not self.network.peers:
+            return "No peers available."
+        for pid in self.ring.get_n(key, self.replication):
+            item = await self.peer(pid).get_item(key)
+            if item is not None and item.flags & FLAG_MANIFEST:
+                item = (await self._join({key: item})).get(key)
+                if item is None:
+                    break
+            if item is not None:
+                return self.codec.decode(item)
+        return "MISS"
+
+    async def delete(self, key: str) -> str:
+        if not self.network.peers:
+            return "No peers available."
+        targets = self.ring.get_n(key, self.replication)
+        await asyncio.gather(*(self.peer(pid).delete(key) for pid in targets))
+        return f"DELETE {key} from {targets}"
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fetch many keys with one pipelined multi-get per owning peer; only
+        keys missing from a batch are retried on their next replica.
+        """
+        items = await self.get_many_items(keys)
+        return {key: self.codec.decode(item) for key, item in items.items()}
+
+    async def get_many_items(self, keys: Iterable[str]) -> Dict[str, Item]:
+        """
+        ``get_many`` without decoding: each hit as the ``Item`` (payload and
+        flags) it was stored as, chunked values already joined.
+        """
+        if not self.network.peers:
+            return {}
+        items = await self._get_items(dict.fromkeys(keys))
+        manifests = {k: i for k, i in items.items() if i.flags & FLAG_MANIFEST}
+        if manifests:
+            for key in manifests:
+                del items[key]
+            items.update(await self._join(manifests))
+        return items
+
+    async def _get_items(self, keys: Iterable[str]) -> Dict[str, Item]:
+        owners = {k: self.ring.get_n(k, self.replication) for k in keys}
+        found: Dict[str, Item] = {}
+        pending = list(owners)
+
+        for rank in range(self.replication):
+            batches: Dict[str, List[str]] = defaultdict(list)
+            for key in pending:
+                if rank < len(owners[key]):
+                    batches[owners[key][rank]].append(key)
+            if not batches:
+                break
+
+            results = await asyncio.gather(
+                *(self.peer(pid).get_many_items(ks) for pid, ks in batches.items())
+            )
+            for hits in results:
+                found.update(hits)
+
+            pending = [k for k in pending if k not in found]
+            if not pending:
+                break
+
+        return found
+
+    async def _join(self, manifests: Dict[str, Item]) -> Dict[str, Item]:
+        """Fetch and reassemble chunked values; incomplete ones are dropped."""
+        parsed = {key: Manifest.from_item(item) for key, item in manifests.items()}
+        chunks = await self._get_items(
+            chunk_key(key, i) for key, m in parsed.items() for i in range(m.chunks)
+        )
+        joined: Dict[str, Item] = {}
+        for key, m in parsed.items():
+            parts = [chunks.get(chunk_key(key, i)) for i in range(m.chunks)]
+            item = join_chunks(m, parts)
+            if item is not None:
+                joined[key] = item
+        return joined
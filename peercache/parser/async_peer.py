@@ -0,0 +1,175 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from peercache.core.codec import Item
+from peercache.parser.peer import Peer
+
+# Parses one complete response off the stream.
+_Parser = Callable[[asyncio.StreamReader], Awaitable[Any]]
+
+
+class AsyncPeer:
+    """
+    asyncio client for one memcached peer over a single pipelined connection.
+
+    Requests are written back-to-back without waiting for earlier replies; a
+    reader task resolves waiters in FIFO order, since memcached answers text
+    protocol requests in the order they were received.
+    """
+
+    def __init__(
+        self, peer_id: str, port: int, host: str = "localhost", timeout: float = 1.0
+    ) -> None:
+        self.id = peer_id
+        self.port = port
+        self.host = host
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: "asyncio.Queue[Tuple[asyncio.Future, _Parser]]" = asyncio.Queue()
+        self._read_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+
+    @classmethod
+    def from_peer(cls, peer: Peer, timeout: float = 1.0) -> "AsyncPeer":
+        return cls(peer.id, peer.port, timeout=timeout)
+
+    # ------------------------------------------------------------------ #
+    # Connection management
+    # ------------------------------------------------------------------ #
+    async def connect(self) -> None:
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            self._pending = asyncio.Queue()
+            self._read_task = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self._writer = None
+        self._fail_pending(ConnectionError(f"Peer {self.id} connection closed"))
+
+    async def _read_loop(self) -> None:
+        reader = self._reader
+        try:
+            while True:
+                fut, parse = await self._pending.get()
+                result = await parse(reader)
+                if not fut.done():
+                    fut.set_result(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # The stream is out of sync; drop the connection and fail waiters.
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(exc, fut)
+
+    def _fail_pending(self, exc: Exception, current: Optional[asyncio.Future] = None):
+        if current is not None and not current.done():
+            current.set_exception(exc)
+        while not self._pending.empty():
+            fut, _ = self._pending.get_nowait()
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def _request(self, payload: bytes, parse: _Parser) -> Any:
+        if self._writer is None or self._writer.is_closing():
+            await self.connect()
+        fut = asyncio.get_running_loop().create_future()
+        # write + enqueue with no await in between keeps replies in order.
+        self._writer.write(payload)
+        self._pending.put_nowait((fut, parse))
+        await self._writer.drain()
+        return await asyncio.wait_for(fut, self.timeout)
+
+    # ------------------------------------------------------------------ #
+    # Cache operations
+    # ------------------------------------------------------------------ #
+    async def get(self, key: str) -> Optional[bytes]:
+        found = await self.get_many([key])
+        return found.get(key)
+
+    async def get_item(self, key: str) -> Optional[Item]:
+        found = await self.get_many_items([key])
+        return found.get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Fetch *keys* with one multi-key ``get``; missing keys are absent."""
+        items = await self.get_many_items(keys)
+        return {k: item.value for k, item in items.items()}
+
+    async def get_many_items(self, keys: List[str]) -> Dict[str, Item]:
+        """Like ``get_many`` but keeps each value's flags."""
+        if not keys:
+            return {}
+        return await self._request(
+            b"get " + " ".join(keys).encode() + b"\r\n", _parse_values
+        )
+
+    async def set(
+        self, key: str, value: Any, expire: int = 0, flags: int = 0
+    ) -> bool:
+        """Store *value*; an ``Item`` carries its own flags."""
+        if isinstance(value, Item):
+            value, flags = value
+        data = value.encode() if isinstance(value, str) else bytes(value)
+        header = f"set {key} {flags} {expire} {len(data)}\r\n".encode()
+        reply = await self._request(header + data + b"\r\n", _parse_line)
+        return reply == b"STORED"
+
+    async def delete(self, key: str) -> bool:
+        reply = await self._request(f"delete {key}\r\n".encode(), _parse_line)
+        return reply == b"DELETED"
+
+    async def touch(self, key: str, expire: int = 0) -> bool:
+        reply = await self._request(f"touch {key} {expire}\r\n".encode(), _parse_line)
+        return reply == b"TOUCHED"
+
+    async def stats(self) -> Dict[str, str]:
+        return await self._request(b"stats\r\n", _parse_stats)
+
+
+# ---------------------------------------------------------------------- #
+# Response parsers
+# ---------------------------------------------------------------------- #
+async def _parse_line(reader: asyncio.StreamReader) -> bytes:
+    line = (await reader.readline()).rstrip(b"\r\n")
+    if not line:
+        raise ConnectionError("Connection closed by peer")
+    if line.startswith((b"ERROR", b"CLIENT_ERROR", b"SERVER_ERROR")):
+        raise RuntimeError(line.decode(errors="replace"))
+    return line
+
+
+async def _parse_values(reader: asyncio.StreamReader) -> Dict[str, Item]:
+    items: Dict[str, Item] = {}
+    while True:
+        line = await _parse_line(reader)
+        if line == b"END":
+            return items
+        _, key, flags, size = line.split()[:4]
+        data = await reader.readexactly(int(size) + 2)
+        items[key.decode()] = Item(data[:-2], int(flags))
+
+
+async def _parse_stats(reader: asyncio.StreamReader) -> Dict[str, str]:
+    stats: Dict[str, str] = {}
+    while True:
+        line = await _parse_line(reader)
+        if line == b"END":
+            return stats
+        _, name, value = line.decode().split(" ", 2)
+        stats[name] = value
@@ -0,0 +1,214 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from peercache.parser.network import Network
+
+# Counters turned into per-second rates between two samples.
+_RATES = {
+    "gets_per_sec": "cmd_get",
+    "sets_per_sec": "cmd_set",
+    "evictions_per_sec": "evictions",
+}
+
+
+class ClusterCollector:
+    """
+    Samples ``stats`` (and optionally ``stats slabs``) from every peer of a
+    network concurrently, so a sample costs one round trip rather than one
+    per peer.
+
+    ``sample()`` returns a JSON-able dict with per-peer and cluster totals:
+    ops/s, gets/s, sets/s, evictions/s and hit ratio over the interval since
+    the previous sample, plus current bytes, items and per-slab usage. The
+    first sample has no interval, so its rates are 0 and its hit ratio is the
+    lifetime one. Unreachable peers are reported with ``"up": False``.
+    """
+
+    def __init__(self, network: Network, slabs: bool = True) -> None:
+        self.network = network
+        self.slabs = slabs
+        self._prev: Optional[Dict[str, Any]] = None
+
+    def snapshot(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Raw ``stats`` per peer (``None`` if the peer didn't answer)."""
+        peers = list(self.network.peers)
+        if not peers:
+            return {}
+        return self.network._fan_out(
+            lambda pid, _: self._peer_stats(pid), {pid: None for pid in peers}
+        )
+
+    def _peer_stats(self, pid: str) -> Optional[Dict[str, Any]]:
+        try:
+            peer = self.network.peer(pid)
+            stats = peer.stats()
+            if self.slabs:
+                stats["slabs"] = _slab_usage(peer.stats("slabs"))
+            return stats
+        except Exception:
+            return None
+
+    def sample(self) -> Dict[str, Any]:
+        now = time.time()
+        raw = self.snapshot()
+        prev = self._prev
+        interval = now - prev["ts"] if prev is not None else 0.0
+
+        peers: Dict[str, Dict[str, Any]] = {}
+        for pid, stats in sorted(raw.items()):
+            if stats is None:
+                peers[pid] = {"up": False}
+                continue
+            before = prev["raw"].get(pid) if prev is not None else None
+            peers[pid] = _peer_sample(stats, before, interval)
+
+        up = [p for p in peers.values() if p["up"]]
+        hits = sum(p["get_hits"] for p in up)
+        misses = sum(p["get_misses"] for p in up)
+        cluster: Dict[str, Any] = {
+            "peers_up": len(up),
+            "peers_down": len(peers) - len(up),
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        }
+        for name in ("ops_per_sec", *_RATES, "bytes", "limit_maxbytes"):
+            cluster[name] = sum(p[name] for p in up)
+        cluster["curr_items"] = sum(p["curr_items"] for p in up)
+
+        self._prev = {"ts": now, "raw": raw}
+        return {
+            "ts": now,
+            "network": self.network.name,
+            "interval": interval,
+            "cluster": cluster,
+            "peers": peers,
+        }
+
+
+def _peer_sample(
+    stats: Dict[str, Any], before: Optional[Dict[str, Any]], interval: float
+) -> Dict[str, Any]:
+    def delta(name: str) -> int:
+        now = int(stats.get(name, 0))
+        if before is None:
+            return now
+        # A restarted peer resets its counters; count from zero again.
+        diff = now - int(before.get(name, 0))
+        return diff if diff >= 0 else now
+
+    hits, misses = delta("get_hits"), delta("get_misses")
+    out: Dict[str, Any] = {
+        "up": True,
+        "get_hits": hits,
+        "get_misses": misses,
+        "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        "bytes": int(stats.get("bytes", 0)),
+        "limit_maxbytes": int(stats.get("limit_maxbytes", 0)),
+        "curr_items": int(stats.get("curr_items", 0)),
+    }
+    for name, counter in _RATES.items():
+        timed = before is not None and interval > 0
+        out[name] = delta(counter) / interval if timed else 0.0
+    out["ops_per_sec"] = out["gets_per_sec"] + out["sets_per_sec"]
+    if "slabs" in stats:
+        out["slabs"] = stats["slabs"]
+    return out
+
+
+def _slab_usage(raw: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Group ``stats slabs`` lines (``<class>:<field>``) by slab class."""
+    slabs: Dict[str, Dict[str, int]] = {}
+    for key, value in raw.items():
+        cls, sep, field = key.partition(":")
+        if sep and field in (
+            "chunk_size",
+            "total_chunks",
+            "used_chunks",
+            "total_pages",
+            "mem_requested",
+        ):
+            slabs.setdefault(cls, {})[field] = int(value)
+    return slabs
+
+
+def format_sample(sample: Dict[str, Any]) -> str:
+    """One screenful for ``network <name> --watch``."""
+    c = sample["cluster"]
+    lines = [
+        f"Network {sample['network']} @ {time.strftime('%H:%M:%S')} "
+        f"| peers {c['peers_up']} up, {c['peers_down']} down",
+        f"  ops/s {c['ops_per_sec']:>10,.0f} | hit {c['hit_ratio']:6.1%} "
+        f"| evictions/s {c['evictions_per_sec']:>8,.1f} "
+        f"| items {c['curr_items']:,} "
+        f"| {_mb(c['bytes'])}/{_mb(c['limit_maxbytes'])}",
+    ]
+    for pid, p in sample["peers"].items():
+        if not p["up"]:
+            lines.append(f"  {pid:<12} DOWN")
+            continue
+        slab_usage = p.get("slabs", {})
+        used = sum(s.get("used_chunks", 0) for s in slab_usage.values())
+        slabs = f" | {len(slab_usage)} slabs, {used:,} chunks" if used else ""
+        lines.append(
+            f"  {pid:<12} ops/s {p['ops_per_sec']:>9,.0f} "
+            f"| hit {p['hit_ratio']:6.1%} "
+            f"| evict/s {p['evictions_per_sec']:>7,.1f} "
+            f"| {_mb(p['bytes'])}{slabs}"
+        )
+    return "\n".join(lines)
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1_048_576:.1f} MB"
+
+
+class StatsRecorder:
+    """
+    Streams ``ClusterCollector`` samples to a JSONL file from a daemon thread,
+    one line every ``interval`` seconds until ``stop()`` (or the ``with``
+    block ends). Each line is written and closed at once, so a crashed run
+    keeps its samples.
+    """
+
+    def __init__(self, network: Network, path: str | Path, interval: float = 1.0):
+        self.collector = ClusterCollector(network)
+        self.path = Path(path)
+        self.interval = interval
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StatsRecorder":
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="peercache-stats", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, sample: Dict[str, Any]) -> None:
+        """Append one sample as a JSON line; callers sampling themselves use it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(sample) + "\n")
+        self.samples += 1
+
+    def _run(self) -> None:
+        while True:
+            self.write(self.collector.sample())
+            if self._stop.wait(self.interval):
+                break
+
+    def __enter__(self) -> "StatsRecorder":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
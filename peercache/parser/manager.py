@@ -73,9 +73,11 @@ class NetworkManager:
             if network.name == name:
                 self.networks.remove(network)
 
-                network_file = Path(SETTINGS.NETWORKS_FOLDER_PATH) / f"{name}.json"
-                if network_file.exists():
-                    network_file.unlink()
+                folder = Path(SETTINGS.NETWORKS_FOLDER_PATH)
+                for suffix in (".json", ".hot.json"):
+                    network_file = folder / f"{name}{suffix}"
+                    if network_file.exists():
+                        network_file.unlink()
 
                 self._save()
                 return f"Network '{name}' deleted successfully."
@@ -1,30 +1,178 @@
 import json
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from peercache.settings.settings import SETTINGS
-from peercache.parser.peer import Peer
-from peercache.core.hashing import ConsistentHashRing
+from peercache.parser.peer import DEFAULT_MEMORY_MB, Peer
+from peercache.core.codec import (
+    FLAG_BYTES,
+    FLAG_MANIFEST,
+    Item,
+    Manifest,
+    ValueCodec,
+    chunk_key,
+    chunk_parent,
+    join_chunks,
+    split_chunks,
+)
+from peercache.core.metrics import METRICS
+from peercache.core.hashing import RangeMove, moved_fraction
+from peercache.core.placement import PLACEMENTS, make_placement
+from peercache.core.nearcache import NearCache
+from peercache.core.sketch import HotKeyTracker
+
+
+# Upper bound on concurrent per-peer requests issued by a single Network.
+_FANOUT_WORKERS = 32
+
+# Hedge delay used until enough primary read latencies have been observed.
+_HEDGE_DEFAULT_DELAY = 0.010
+_HEDGE_WINDOW = 1024
+_HEDGE_MIN_SAMPLES = 32
+
+# Label sets for peercache_requests_total, built once.
+_GET_HIT = (("op", "get"), ("result", "hit"))
+_GET_MISS = (("op", "get"), ("result", "miss"))
+_GET_L1_HIT = (("op", "get"), ("result", "l1_hit"))
+
+# Default chunk size: comfortably below memcached's 1 MB item limit.
+_CHUNK_SIZE = 512 * 1024
+
+# Spilled keys remembered per client, so a later unspilled write can drop
+# the copy left on the ring successor.
+_SPILL_MEMORY = 4096
+
+# Longest expiry memcached treats as relative (30 days).
+_RELATIVE_EXPIRY_LIMIT = 60 * 60 * 24 * 30
+
+# Seconds between saves of the per-peer load counters shown by ``--show``.
+_HOT_SAVE_INTERVAL = 5.0
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    """Write-then-rename so readers never see a truncated file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _stored(fut: Future) -> bool:
+    """Whether a finished replica write got a STORED reply."""
+    return fut.exception() is None and fut.result() is True
 
 
 class Network:
     """
     A single Memcached network with a consistent-hash ring and optional replication.
-    Each network is stored in state/network/<name>.json
+    ``placement`` swaps the ring for another strategy from ``PLACEMENTS``.
+    ``strict`` raises on an unreadable state file instead of starting empty.
+    Each network is stored in state/network/<name>.json; hot keys and
+    per-peer load live apart in <name>.hot.json, so saving them from worker
+    threads never rewrites the operator-managed settings.
     """
 
-    def __init__(self, name: str, replication: int = 1, vnodes: int = 100) -> None:
+    def __init__(
+        self,
+        name: str,
+        replication: int = 1,
+        vnodes: int = 100,
+        write_quorum: Optional[int] = None,
+        write_timeout: float = 1.0,
+        hedge_reads: bool = False,
+        hedge_delay_ms: Optional[float] = None,
+        hash_fn: str = "md5",
+        l1_bytes: int = 0,
+        l1_ttl: float = 1.0,
+        hot_threshold: int = 0,
+        hot_extra: int = 1,
+        compress_threshold: int = 0,
+        chunk_size: int = _CHUNK_SIZE,
+        bounded_load: float = 0.0,
+        placement: str = "ring",
+        strict: bool = False,
+    ) -> None:
         self.name = name
         self.peers: List[str] = []
         self.write = True
         self.replication = replication
         self.vnodes = vnodes
+        self.hash_fn = hash_fn
+        # W replicas must ack a cache_set; None means "all replicas".
+        self.write_quorum = write_quorum
+        self.write_timeout = write_timeout
+        # Opt-in hedged reads; a None delay tracks the observed primary p95.
+        self.hedge_reads = hedge_reads
+        self.hedge_delay_ms = hedge_delay_ms
+        # Optional in-process near cache; 0 bytes disables it.
+        self.l1_bytes = l1_bytes
+        self.l1_ttl = l1_ttl
+        self.l1: Optional[NearCache] = None
+        # Keys seen >= hot_threshold times (0 disables) get hot_extra replicas.
+        self.hot_threshold = hot_threshold
+        self.hot_extra = hot_extra
+        self.hot: Optional[HotKeyTracker] = None
+        self.hot_keys: List[str] = []
+        self.peer_load: Dict[str, int] = defaultdict(int)
+        # Values at least this many bytes are zlib-compressed (0 disables).
+        self.compress_threshold = compress_threshold
+        # Encoded values larger than this are split into chunks (0 disables).
+        self.chunk_size = chunk_size
+        # peer_id -> capacity weight (memory MB by default); vnodes scale with it.
+        self.weights: Dict[str, float] = {}
+        # Bounded-load epsilon: no peer takes more than (1 + eps) x the mean
+        # in-flight load (0 disables).
+        self.bounded_load = bounded_load
+        # Placement strategy (a key of PLACEMENTS); "ring" uses vnodes.
+        self.placement = placement
         self.file_path = Path(SETTINGS.NETWORKS_FOLDER_PATH) / f"{self.name}.json"
+        self.hot_path = self.file_path.with_name(f"{self.name}.hot.json")
+        self._hot_saved = time.monotonic()
+
+        # peer_id -> resolved Peer (port + client handle), plus the mtime of the
+        # state file each entry was loaded from.
+        self._directory: Dict[str, Peer] = {}
+        self._directory_mtimes: Dict[str, float] = {}
+
+        # Lazily created worker pool for concurrent per-peer fan-out.
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+        # peer_id -> {"acks", "errors", "timeouts"} for replica writes.
+        self.write_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"acks": 0, "errors": 0, "timeouts": 0}
+        )
+        self._stats_lock = threading.Lock()
 
-        self._load_or_initialize()
+        # Keys this client last wrote past a loaded owner (most recent last).
+        self._spilled: "OrderedDict[str, None]" = OrderedDict()
+        self._spill_lock = threading.Lock()
+
+        # Ranges whose primary owner changed on the last add/remove_peer.
+        self.last_moves: List[RangeMove] = []
+
+        self.hedge_stats: Dict[str, int] = {"sent": 0, "won": 0}
+        self._read_lat: deque = deque(maxlen=_HEDGE_WINDOW)
+        self._read_p95: Optional[float] = None
+        self._read_seen = 0
+
+        self._load_or_initialize(strict)
+        self._load_hot()
         self._build_ring()
+        self._build_l1()
+        self._build_hot()
+        self.codec = ValueCodec(self.compress_threshold)
 
-    def _load_or_initialize(self):
+    def _load_or_initialize(self, strict: bool = False):
         if self.file_path.exists():
             try:
                 with open(self.file_path, "r") as f:
@@ -33,8 +181,28 @@ class Network:
                 self.write = data.get("write", True)
                 self.replication = data.get("replication", self.replication)
                 self.vnodes = data.get("vnodes", self.vnodes)
+                self.hash_fn = data.get("hash_fn", self.hash_fn)
+                self.write_quorum = data.get("write_quorum", self.write_quorum)
+                self.write_timeout = data.get("write_timeout", self.write_timeout)
+                self.hedge_reads = data.get("hedge_reads", self.hedge_reads)
+                self.hedge_delay_ms = data.get("hedge_delay_ms", self.hedge_delay_ms)
+                self.l1_bytes = data.get("l1_bytes", self.l1_bytes)
+                self.l1_ttl = data.get("l1_ttl", self.l1_ttl)
+                self.hot_threshold = data.get("hot_threshold", self.hot_threshold)
+                self.hot_extra = data.get("hot_extra", self.hot_extra)
+                self.compress_threshold = data.get(
+                    "compress_threshold", self.compress_threshold
+                )
+                self.chunk_size = data.get("chunk_size", self.chunk_size)
+                self.weights = data.get("weights", {})
+                self.bounded_load = data.get("bounded_load", self.bounded_load)
+                self.placement = data.get("placement", self.placement)
             except (json.JSONDecodeError, IOError):
+                if strict:
+                    raise
                 self.peers = []
+        elif strict:
+            raise FileNotFoundError(self.file_path)
         else:
             self._save()
 
@@ -45,52 +213,891 @@ class Network:
             "write": self.write,
             "replication": self.replication,
             "vnodes": self.vnodes,
+            "hash_fn": self.hash_fn,
+            "write_quorum": self.write_quorum,
+            "write_timeout": self.write_timeout,
+            "hedge_reads": self.hedge_reads,
+            "hedge_delay_ms": self.hedge_delay_ms,
+            "l1_bytes": self.l1_bytes,
+            "l1_ttl": self.l1_ttl,
+            "hot_threshold": self.hot_threshold,
+            "hot_extra": self.hot_extra,
+            "compress_threshold": self.compress_threshold,
+            "chunk_size": self.chunk_size,
+            "weights": self.weights,
+            "bounded_load": self.bounded_load,
+            "placement": self.placement,
         }
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        self.file_path.write_text(json.dumps(payload, indent=2))
+        _write_json(self.file_path, payload)
+
+    def _load_hot(self) -> None:
+        """Restore hot keys and per-peer load counts of current peers."""
+        try:
+            data = json.loads(self.hot_path.read_text())
+        except (json.JSONDecodeError, IOError):
+            return
+        self.hot_keys = data.get("hot_keys", [])
+        loads = data.get("peer_load", {})
+        self.peer_load.update((p, loads[p]) for p in self.peers if p in loads)
 
     def _build_ring(self):
-        self.ring = ConsistentHashRing(self.peers, virtual_nodes=self.vnodes)
+        self.ring = make_placement(
+            self.placement,
+            self.peers,
+            hash_fn=self.hash_fn,
+            replicas=self.replication,
+            weights=self._vnode_weights(),
+            virtual_nodes=self.vnodes,
+        )
+        self.refresh_peers()
+
+    def _vnode_weights(self) -> Dict[str, float]:
+        """
+        Peer weights relative to the lightest peer, which gets ``vnodes``
+        points; equal weights therefore keep the unweighted placement.
+        """
+        weights = {pid: self.weights.get(pid, DEFAULT_MEMORY_MB) for pid in self.peers}
+        if not weights:
+            return {}
+        least = min(weights.values())
+        return {pid: w / least for pid, w in weights.items()}
+
+    def _default_weight(self, peer_id: str) -> float:
+        """The peer's memory size, if its state file recorded one."""
+        path = Path(SETTINGS.PEER_FOLDER_PATH) / f"{peer_id}.json"
+        memory = Peer(peer_id).memory_mb if path.exists() else None
+        return float(memory or DEFAULT_MEMORY_MB)
+
+    def _reweighted(self) -> bool:
+        """True if any ringed peer's relative weight no longer matches."""
+        scaled = self._vnode_weights()
+        return any(self.ring.weights.get(pid, w) != w for pid, w in scaled.items())
+
+    def _rebuild_ring(self) -> List[RangeMove]:
+        """Rebuild the ring from scratch and return the ranges that moved."""
+        old = self.ring
+        self._build_ring()
+        return old.diff(self.ring)
+
+    def _build_l1(self):
+        self.l1 = NearCache(self.l1_bytes, self.l1_ttl) if self.l1_bytes > 0 else None
+
+    def _build_hot(self):
+        if self.hot_threshold <= 0:
+            self.hot = None
+            return
+        self.hot = HotKeyTracker(
+            self.hot_threshold,
+            on_promote=self._on_hot_promote,
+            on_demote=self._on_hot_demote,
+        )
+        # Keys promoted by an earlier process keep their spread until they cool.
+        self.hot.hot_keys.update(self.hot_keys)
+
+    # ------------------------------------------------------------------ #
+    # Peer directory
+    # ------------------------------------------------------------------ #
+    def refresh_peers(self) -> None:
+        """
+        Re-sync the in-memory peer directory with ``state/peer/<id>.json``.
+
+        Only entries whose state file appeared, vanished or changed mtime are
+        reloaded; peers without a state file are resolved lazily by ``peer()``.
+        """
+        for pid in list(self._directory):
+            if pid not in self.peers:
+                self._directory.pop(pid, None)
+                self._directory_mtimes.pop(pid, None)
+
+        for pid in self.peers:
+            path = Path(SETTINGS.PEER_FOLDER_PATH) / f"{pid}.json"
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                self._directory.pop(pid, None)
+                self._directory_mtimes.pop(pid, None)
+                continue
+            if self._directory_mtimes.get(pid) != mtime:
+                self._directory[pid] = Peer(pid)
+                self._directory_mtimes[pid] = mtime
+
+    def peer(self, peer_id: str) -> Peer:
+        """Return the resolved ``Peer`` for *peer_id* without touching disk."""
+        peer = self._directory.get(peer_id)
+        if peer is None:
+            peer = Peer(peer_id)
+            self._directory[peer_id] = peer
+        return peer
 
     def add_peer(self, peer_id: str) -> str:
         if peer_id not in self.peers:
             self.peers.append(peer_id)
+            if peer_id not in self.weights:
+                self.weights[peer_id] = self._default_weight(peer_id)
             self._save()
-            self._build_ring()
-            return f"Peer '{peer_id}' added to network '{self.name}'."
+            if self._reweighted():
+                # A new lightest peer rescales everyone's vnode counts.
+                self.last_moves = self._rebuild_ring()
+            else:
+                weight = self._vnode_weights()[peer_id]
+                self.last_moves = self.ring.add_peer(peer_id, weight=weight)
+            self.refresh_peers()
+            moved = moved_fraction(self.last_moves)
+            return (
+                f"Peer '{peer_id}' added to network '{self.name}' "
+                f"({moved:.1%} of keyspace moved)."
+            )
         return f"Peer '{peer_id}' already exists in network '{self.name}'."
 
     def remove_peer(self, peer_id: str) -> str:
         if peer_id in self.peers:
-            self.peers.remove(peer_id)
+            # The placement decides the order left (jump buckets are positions).
+            self.peers = self.ring.without(self.peers, peer_id)
+            self.weights.pop(peer_id, None)
+            self.peer_load.pop(peer_id, None)
             self._save()
-            self._build_ring()
-            return f"Peer '{peer_id}' removed from network '{self.name}'."
+            if self._reweighted():
+                # The lightest peer left; the others' vnode counts shrink.
+                self.last_moves = self._rebuild_ring()
+            else:
+                self.last_moves = self.ring.remove_peer(peer_id)
+            self.refresh_peers()
+            moved = moved_fraction(self.last_moves)
+            return (
+                f"Peer '{peer_id}' removed from network '{self.name}' "
+                f"({moved:.1%} of keyspace moved)."
+            )
         return f"Peer '{peer_id}' not found in network '{self.name}'."
 
-    def cache_set(self, key: str, value: str) -> str:
+    def set_replication(self, replication: int) -> str:
+        """Persist a new replication factor and rebuild the ring's tables."""
+        if replication < 1:
+            return "Replication must be at least 1."
+        self.replication = replication
+        if self.write_quorum is not None and self.write_quorum > replication:
+            self.write_quorum = replication
+        self._save()
+        self._build_ring()
+        return f"Replication for network '{self.name}' set to {replication}."
+
+    def set_write_quorum(self, quorum: int, timeout: Optional[float] = None) -> str:
+        """Persist a new write quorum W (1 <= W <= replication)."""
+        if not 1 <= quorum <= self.replication:
+            return (
+                f"Write quorum must be between 1 and {self.replication} "
+                f"for network '{self.name}'."
+            )
+        self.write_quorum = quorum
+        if timeout is not None:
+            self.write_timeout = timeout
+        self._save()
+        return f"Write quorum for network '{self.name}' set to {quorum}."
+
+    def set_hedging(self, enabled: bool, delay_ms: Optional[float] = None) -> str:
+        """
+        Persist the hedged-read mode. A ``None`` delay derives the hedge
+        trigger from the observed p95 of primary reads.
+        """
+        self.hedge_reads = enabled
+        self.hedge_delay_ms = delay_ms
+        self._save()
+        state = "enabled" if enabled else "disabled"
+        return f"Hedged reads {state} for network '{self.name}'."
+
+    def set_near_cache(self, max_bytes: int, ttl: Optional[float] = None) -> str:
+        """Persist the L1 near-cache size (0 disables it) and TTL."""
+        self.l1_bytes = max(0, max_bytes)
+        if ttl is not None:
+            self.l1_ttl = ttl
+        self._save()
+        self._build_l1()
+        if not self.l1_bytes:
+            return f"Near cache disabled for network '{self.name}'."
+        return (
+            f"Near cache for network '{self.name}' set to "
+            f"{self.l1_bytes} bytes, TTL {self.l1_ttl}s."
+        )
+
+    def set_hot_keys(self, threshold: int, extra: Optional[int] = None) -> str:
+        """Persist the hot-key threshold (0 disables) and extra replica count."""
+        self.hot_threshold = max(0, threshold)
+        if extra is not None:
+            self.hot_extra = max(1, extra)
+        if not self.hot_threshold:
+            self.hot_keys = []
+            self._persist_hot()
+        self._save()
+        self._build_hot()
+        if not self.hot_threshold:
+            return f"Hot-key replication disabled for network '{self.name}'."
+        return (
+            f"Hot keys for network '{self.name}': threshold {self.hot_threshold}, "
+            f"+{self.hot_extra} replicas."
+        )
+
+    def set_compression(self, threshold: int) -> str:
+        """Persist the zlib compression threshold in bytes (0 disables)."""
+        self.compress_threshold = max(0, threshold)
+        self.codec = ValueCodec(self.compress_threshold)
+        self._save()
+        if not self.compress_threshold:
+            return f"Compression disabled for network '{self.name}'."
+        return (
+            f"Values >= {self.compress_threshold} bytes are compressed "
+            f"in network '{self.name}'."
+        )
+
+    def set_weight(self, peer_id: str, weight: float) -> str:
+        """Persist a peer's capacity weight and re-place its vnodes."""
+        if peer_id not in self.peers:
+            return f"Peer '{peer_id}' is not in network '{self.name}'."
+        if weight <= 0:
+            return "Weight must be positive."
+        self.weights[peer_id] = float(weight)
+        self._save()
+        self.last_moves = self._rebuild_ring()
+        moved = moved_fraction(self.last_moves)
+        return (
+            f"Weight of '{peer_id}' set to {weight:g} "
+            f"({self.ring.share(peer_id)}, {moved:.1%} of keyspace moved)."
+        )
+
+    def set_placement(self, placement: str) -> str:
+        """Persist a new placement strategy and re-place every key."""
+        if placement not in PLACEMENTS:
+            return (
+                f"Unknown placement '{placement}'; "
+                f"choose one of {', '.join(PLACEMENTS)}."
+            )
+        self.placement = placement
+        self._save()
+        self.last_moves = self._rebuild_ring()
+        moved = moved_fraction(self.last_moves)
+        return (
+            f"Placement for network '{self.name}' set to {placement} "
+            f"({moved:.1%} of keyspace moved)."
+        )
+
+    def set_bounded_load(self, epsilon: float) -> str:
+        """
+        Persist the bounded-load epsilon: a request skips ring owners already
+        carrying over (1 + epsilon) x the mean in-flight load (0 disables).
+        """
+        self.bounded_load = max(0.0, epsilon)
+        self._save()
+        if not self.bounded_load:
+            return f"Bounded loads disabled for network '{self.name}'."
+        return (
+            f"Peers in network '{self.name}' are capped at "
+            f"{1 + self.bounded_load:g}x the mean in-flight load."
+        )
+
+    def set_chunking(self, chunk_size: int) -> str:
+        """Persist the chunk size in bytes (0 stores every value whole)."""
+        self.chunk_size = max(0, chunk_size)
+        self._save()
+        if not self.chunk_size:
+            return f"Chunking disabled for network '{self.name}'."
+        return (
+            f"Values > {self.chunk_size} bytes are chunked "
+            f"in network '{self.name}'."
+        )
+
+    # ------------------------------------------------------------------ #
+    # Hot keys
+    # ------------------------------------------------------------------ #
+    def _holders(self, key: str, reading: bool = False) -> List[str]:
+        """Replica set for *key*, widened by ``hot_extra`` while it is hot."""
+        n = self.replication
+        if self.hot is not None and self.hot.record(key):
+            n += self.hot_extra
+        if self.bounded_load > 0:
+            return self._bounded(key, n, reading)
+        return self.ring.get_n(key, n)
+
+    def _bounded(self, key: str, n: int, reading: bool) -> List[str]:
+        """
+        *n* holders under consistent hashing with bounded loads: owners at the
+        cap are passed over for the next one on the ring. Spills stay within
+        the plain owners plus one successor, which reads probe in full, and
+        writes drop the copy on whichever of those they skip.
+        """
+        window = self.ring.get_n(key, n + 1)
+        loads = {pid: self.peer(pid).inflight for pid in self.peers}
+        mean = (sum(loads.values()) + 1) / len(loads)
+        cap = math.ceil((1 + self.bounded_load) * mean)
+        # Peers outside the window count as full, so they are never picked.
+        loads.update((pid, math.inf) for pid in self.peers if pid not in window)
+        targets = self.ring.get_bounded(key, n, loads, cap)
+        if reading:
+            targets += [pid for pid in window if pid not in targets]
+        return targets
+
+    def _skipped(self, key: str, targets: List[str]) -> List[str]:
+        """
+        Peers in *key*'s bounded-load window whose copy a write to *targets*
+        must drop: the owners it spilled past or, on a write that didn't
+        spill, the successor if this client spilled *key* there before.
+        """
+        if self.bounded_load <= 0:
+            return []
+        window = self.ring.get_n(key, len(targets) + 1)
+        owners, successor = window[: len(targets)], window[len(targets) :]
+        with self._spill_lock:
+            if set(owners) != set(targets):
+                self._spilled[key] = None
+                self._spilled.move_to_end(key)
+                if len(self._spilled) > _SPILL_MEMORY:
+                    self._spilled.popitem(last=False)
+                return [pid for pid in owners if pid not in targets]
+            if key in self._spilled:
+                del self._spilled[key]
+                return successor
+        return []
+
+    def _drop_skipped(self, key: str, targets: List[str]) -> List[Future]:
+        """Start deleting *key* from the peers ``_skipped`` names."""
+        pool = self._executor()
+        return [
+            pool.submit(self.peer(pid).delete_many, [key])
+            for pid in self._skipped(key, targets)
+        ]
+
+    def _on_hot_promote(self, key: str) -> None:
+        self._executor().submit(self._spread_hot_key, key)
+
+    def _on_hot_demote(self, key: str) -> None:
+        self._executor().submit(self._shrink_hot_key, key)
+
+    def _spread_hot_key(self, key: str) -> None:
+        """
+        Copy a newly hot key from its base replicas to the extra holders. The
+        copies keep the remaining TTL and are ``add``-ed, so a newer value a
+        concurrent write already put on an extra holder is left alone.
+        """
+        base = self.ring.get_n(key, self.replication)
+        extra = self.ring.get_n(key, self.replication + self.hot_extra)[len(base) :]
+        for pid in base:
+            item = self.peer(pid).get_item(key)
+            if item is None:
+                continue
+            ttl = self.peer(pid).ttl(key)
+            if ttl is not None and ttl != 0:
+                # memcached reads expiries over 30 days as unix timestamps.
+                expire = max(ttl, 0)
+                if expire > _RELATIVE_EXPIRY_LIMIT:
+                    expire += int(time.time())
+                for target in extra:
+                    self.peer(target).add(key, item, expire)
+            break
+        self._persist_hot()
+
+    def _shrink_hot_key(self, key: str) -> None:
+        """Drop the extra copies of a key that cooled down."""
+        base = self.ring.get_n(key, self.replication)
+        extra = self.ring.get_n(key, self.replication + self.hot_extra)[len(base) :]
+        for pid in extra:
+            self.peer(pid).delete_many([key])
+        self._persist_hot()
+
+    def _persist_hot(self) -> None:
+        if self.hot is not None:
+            self.hot_keys = sorted(self.hot.hot_keys)
+        payload = {
+            "hot_keys": self.hot_keys,
+            "peer_load": {pid: self.peer_load.get(pid, 0) for pid in self.peers},
+        }
+        _write_json(self.hot_path, payload)
+
+    def _count_load(self, pids: Iterable[str]) -> None:
+        """Count ops per peer, saving the counts every few seconds."""
+        for pid in pids:
+            self.peer_load[pid] += 1
+        now = time.monotonic()
+        if now - self._hot_saved >= _HOT_SAVE_INTERVAL:
+            self._hot_saved = now
+            self._executor().submit(self._persist_hot)
+
+    def load_skew(self) -> float:
+        """Return max/mean of per-peer op counts (1.0 is perfectly even)."""
+        loads = [self.peer_load.get(pid, 0) for pid in self.peers]
+        mean = sum(loads) / len(loads) if loads else 0
+        return max(loads) / mean if mean else 0.0
+
+    # ------------------------------------------------------------------ #
+    # Fan-out helpers
+    # ------------------------------------------------------------------ #
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=_FANOUT_WORKERS,
+                        thread_name_prefix=f"peercache-{self.name}",
+                    )
+        return self._pool
+
+    def _fan_out(
+        self, fn: Callable[[str, Any], Any], batches: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run ``fn(peer_id, batch)`` for every peer concurrently and return the
+        results keyed by peer. A single batch runs inline on the caller thread.
+        """
+        if len(batches) == 1:
+            ((pid, batch),) = batches.items()
+            return {pid: fn(pid, batch)}
+        pool = self._executor()
+        futures = {pid: pool.submit(fn, pid, batch) for pid, batch in batches.items()}
+        return {pid: fut.result() for pid, fut in futures.items()}
+
+    # ------------------------------------------------------------------ #
+    # Cache operations
+    # ------------------------------------------------------------------ #
+    def cache_set(self, key: str, value: Any, expire: int = 0) -> str:
+        """
+        Store *value* (``str``, ``bytes``/``memoryview`` or a JSON-able
+        object) on the key's replicas, encoded by the network's codec.
+        ``expire`` is a memcached TTL in seconds (0 never expires).
+        """
+        if not self.peers:
+            return "No peers available."
+        start = time.perf_counter_ns()
+        try:
+            return self._cache_set(key, value, expire)
+        finally:
+            METRICS.observe("total", "set", time.perf_counter_ns() - start)
+
+    def _cache_set(self, key: str, value: Any, expire: int = 0) -> str:
+        if self.l1 is not None:
+            self.l1.invalidate(key)
+        t0 = time.perf_counter_ns()
+        item = self.codec.encode(value)
+        METRICS.observe("encode", "set", time.perf_counter_ns() - t0)
+        if self.chunk_size and len(item.value) > self.chunk_size:
+            # Chunks go out first so a visible manifest always has its data.
+            chunks: Dict[str, Dict[str, Item]] = defaultdict(dict)
+            item = self._split(key, item, chunks)
+            results = self._fan_out(
+                lambda pid, b: self.peer(pid).set_many(b, expire=expire), chunks
+            )
+            failed = sorted({k for keys in results.values() for k in keys})
+            if failed:
+                return f"SET {key} failed: chunks {failed} not stored"
+        t0 = time.perf_counter_ns()
+        targets = self._holders(key)
+        METRICS.observe("ring", "set", time.perf_counter_ns() - t0)
+        if self.hot is not None:
+            self._count_load(targets)
+        # Stale copies are dropped alongside the write, not before it.
+        drops = self._drop_skipped(key, targets)
+        result = self._write_replicas(key, item, expire, targets)
+        wait(drops)
+        return result
+
+    def _write_replicas(
+        self, key: str, item: Item, expire: int, targets: List[str]
+    ) -> str:
+        """Write *item* to *targets*, returning once the write quorum acks."""
+        quorum = min(self.write_quorum or self.replication, len(targets))
+
+        if len(targets) == 1:
+            if not self.peer(targets[0]).set(key, item, expire):
+                self._record_write(targets[0], "errors")
+                return f"SET {key} failed: not stored on {targets}"
+            self._record_write(targets[0], "acks")
+            return f"SET {key} replicated to {targets}"
+
+        # Send every replica write in parallel and return as soon as W ack;
+        # stragglers keep running on the pool and report via callback.
+        pool = self._executor()
+        futures = {
+            pool.submit(self.peer(pid).set, key, item, expire): pid for pid in targets
+        }
+        acked: List[str] = []
+        failed: List[str] = []
+        pending = set(futures)
+        deadline = time.monotonic() + self.write_timeout
+
+        while pending and len(acked) < quorum:
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for fut in done:
+                pid = futures[fut]
+                if _stored(fut):
+                    acked.append(pid)
+                    self._record_write(pid, "acks")
+                else:
+                    failed.append(pid)
+                    self._record_write(pid, "errors")
+            if len(acked) + len(pending) < quorum:
+                break
+
+        # Each straggler is counted once: as a timeout if the quorum failed
+        # at the deadline, otherwise by its callback when it finishes.
+        stragglers = [futures[f] for f in pending]
+        timed_out = len(acked) < quorum and time.monotonic() >= deadline
+        if timed_out:
+            for pid in stragglers:
+                self._record_write(pid, "timeouts")
+        else:
+            for fut in pending:
+                fut.add_done_callback(
+                    lambda f, pid=futures[fut]: self._record_write(
+                        pid, "acks" if _stored(f) else "errors"
+                    )
+                )
+
+        if len(acked) >= quorum:
+            return (
+                f"SET {key} replicated to {targets} "
+                f"(acked {acked}, quorum {quorum}/{len(targets)})"
+            )
+        late = "timeouts" if timed_out else "pending"
+        return (
+            f"SET {key} failed quorum {len(acked)}/{quorum}: "
+            f"acked {acked}, errors {failed}, {late} {stragglers}"
+        )
+
+    def _record_write(self, peer_id: str, outcome: str) -> None:
+        with self._stats_lock:
+            self.write_stats[peer_id][outcome] += 1
+
+    def cache_get(self, key: str) -> Any:
+        """
+        Read *key* (L1 first, then its holders). Phase timings land in
+        ``METRICS``; a sampled request is also traced for the profiler hook.
+        """
         if not self.peers:
             return "No peers available."
-        targets = self.ring.get_n(key, self.replication)
+        trace = METRICS.start_trace("get", key)
+        start = time.perf_counter_ns()
+        try:
+            return self._cache_get(key)
+        finally:
+            METRICS.observe("total", "get", time.perf_counter_ns() - start)
+            METRICS.end_trace(trace)
+
+    def _cache_get(self, key: str) -> Any:
+        if self.l1 is not None:
+            cached = self.l1.get(key)
+            if cached is not None:
+                METRICS.inc("peercache_requests_total", _GET_L1_HIT)
+                return cached
+        item = self._remote_get(key)
+        if item is not None and item.flags & FLAG_MANIFEST:
+            item = self._join({key: item}).get(key)
+        if item is None:
+            METRICS.inc("peercache_requests_total", _GET_MISS)
+            return "MISS"
+        METRICS.inc("peercache_requests_total", _GET_HIT)
+        t0 = time.perf_counter_ns()
+        val = self.codec.decode(item)
+        METRICS.observe("decode", "get", time.perf_counter_ns() - t0)
+        if self.l1 is not None:
+            self.l1.put(key, val, len(key) + len(item.value))
+        return val
+
+    def _remote_get(self, key: str) -> Optional[Item]:
+        t0 = time.perf_counter_ns()
+        targets = self._holders(key, reading=True)
+        METRICS.observe("ring", "get", time.perf_counter_ns() - t0)
+        if len(targets) > self.replication and not self.bounded_load:
+            # Hot key: spread reads by starting at a random holder.
+            start = random.randrange(len(targets))
+            targets = targets[start:] + targets[:start]
+        if self.hot is not None:
+            self._count_load(targets[:1])
+        if self.hedge_reads and len(targets) > 1:
+            return self._hedged_get(key, targets)
         for pid in targets:
-            Peer(pid).set(key, value)
-        return f"SET {key} replicated to {targets}"
+            item = self.peer(pid).get_item(key)
+            if item is not None:
+                return item
+        return None
+
+    def _hedged_get(self, key: str, targets: List[str]) -> Optional[Item]:
+        """
+        Ask the primary first; if it has not answered within the hedge delay,
+        send the same get to the next replica. The first non-miss answer wins.
+        """
+        pool = self._executor()
+        delay = self._hedge_delay()
+        start = time.perf_counter()
+        futures: Dict[Any, str] = {}
+        hedges = set()
+        pending = set()
+        next_idx = 0
+
+        def _submit() -> Any:
+            nonlocal next_idx
+            pid = targets[next_idx]
+            next_idx += 1
+            fut = pool.submit(self.peer(pid).get_item, key)
+            futures[fut] = pid
+            pending.add(fut)
+            return fut
+
+        _submit().add_done_callback(
+            lambda f: self._observe_read(time.perf_counter() - start)
+        )
+
+        while True:
+            if not pending:
+                if next_idx >= len(targets):
+                    return None
+                _submit()  # previous replica missed: plain fallback
+
+            more = next_idx < len(targets)
+            done, pending = wait(
+                pending, timeout=delay if more else None, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                hedges.add(_submit())
+                with self._stats_lock:
+                    self.hedge_stats["sent"] += 1
+                continue
+
+            for fut in done:
+                item = fut.result() if fut.exception() is None else None
+                if item is not None:
+                    if fut in hedges:
+                        with self._stats_lock:
+                            self.hedge_stats["won"] += 1
+                    return item
+
+    def _hedge_delay(self) -> float:
+        if self.hedge_delay_ms is not None:
+            return self.hedge_delay_ms / 1000
+        return self._read_p95 if self._read_p95 is not None else _HEDGE_DEFAULT_DELAY
+
+    def _observe_read(self, seconds: float) -> None:
+        """Record a primary read latency; refresh the cached p95 periodically."""
+        with self._stats_lock:
+            self._read_lat.append(seconds)
+            self._read_seen += 1
+            if self._read_seen % _HEDGE_MIN_SAMPLES == 0:
+                window = sorted(self._read_lat)
+                self._read_p95 = window[int(0.95 * (len(window) - 1))]
+
+    def cache_delete(self, key: str) -> str:
+        """
+        Delete *key* from every holder. Chunks of a chunked value are left
+        for the LRU: without their manifest they are unreachable.
+        """
+        if not self.peers:
+            return "No peers available."
+        if self.l1 is not None:
+            self.l1.invalidate(key)
+        targets = self._holders(key, reading=True)
+        self._fan_out(
+            lambda pid, keys: self.peer(pid).delete_many(keys),
+            {pid: [key] for pid in targets},
+        )
+        return f"DELETE {key} from {targets}"
 
-    def cache_get(self, key: str) -> str:
+    def cache_set_many(self, mapping: Dict[str, Any]) -> str:
+        """
+        Store many items with one ``set_many`` per owning peer.
+
+        Every key is sent to all of its replicas; the per-peer batches are
+        issued concurrently.
+        """
         if not self.peers:
             return "No peers available."
-        for pid in self.ring.get_n(key, self.replication):
-            val = Peer(pid).get(key)
-            if val is not None:
-                return val.decode()
-        return "MISS"
+        start = time.perf_counter_ns()
+        batches: Dict[str, Dict[str, Item]] = defaultdict(dict)
+        chunks: Dict[str, Dict[str, Item]] = defaultdict(dict)
+        skipped: Dict[str, List[str]] = defaultdict(list)
+        for key, value in mapping.items():
+            if self.l1 is not None:
+                self.l1.invalidate(key)
+            item = self.codec.encode(value)
+            if self.chunk_size and len(item.value) > self.chunk_size:
+                item = self._split(key, item, chunks)
+            targets = self._holders(key)
+            for pid in targets:
+                batches[pid][key] = item
+            for pid in self._skipped(key, targets):
+                skipped[pid].append(key)
+
+        failed = set()
+        pool = self._executor()
+        drops = [pool.submit(self.peer(p).delete_many, k) for p, k in skipped.items()]
+        if chunks:
+            results = self._fan_out(lambda pid, b: self.peer(pid).set_many(b), chunks)
+            # No manifest for a key unless every one of its chunks was stored.
+            failed.update(chunk_parent(k) for keys in results.values() for k in keys)
+            for batch in batches.values():
+                for key in failed:
+                    batch.pop(key, None)
+            batches = {pid: batch for pid, batch in batches.items() if batch}
+        results = self._fan_out(lambda pid, b: self.peer(pid).set_many(b), batches)
+        failed = sorted(failed.union(k for keys in results.values() for k in keys))
+        wait(drops)
+        METRICS.observe("total", "set_many", time.perf_counter_ns() - start)
+        msg = f"SET {len(mapping)} keys across {sorted(batches)}"
+        return f"{msg}; failed {failed}" if failed else msg
+
+    def cache_get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fetch many keys with one ``get_many`` per owning peer.
+
+        Keys are bucketed by their primary owner and fetched concurrently;
+        only keys missing from a batch are retried on their next replica.
+        Missing keys are absent from the returned mapping.
+        """
+        if not self.peers:
+            return {}
+        start = time.perf_counter_ns()
+        found: Dict[str, Any] = {}
+        wanted = list(dict.fromkeys(keys))
+        if self.l1 is not None:
+            for key in wanted:
+                cached = self.l1.get(key)
+                if cached is not None:
+                    found[key] = cached
+            wanted = [k for k in wanted if k not in found]
+
+        items = self._get_items(wanted)
+        manifests = {k: i for k, i in items.items() if i.flags & FLAG_MANIFEST}
+        if manifests:
+            for key in manifests:
+                del items[key]
+            items.update(self._join(manifests))
+        t0 = time.perf_counter_ns()
+        for key, item in items.items():
+            found[key] = self.codec.decode(item)
+            if self.l1 is not None:
+                self.l1.put(key, found[key], len(key) + len(item.value))
+        end = time.perf_counter_ns()
+        METRICS.observe("decode", "get_many", end - t0)
+        METRICS.observe("total", "get_many", end - start)
+        return found
+
+    def _get_items(self, keys: Iterable[str]) -> Dict[str, Item]:
+        """Raw batched fetch behind ``cache_get_many``, by replica rank."""
+        found: Dict[str, Item] = {}
+        t0 = time.perf_counter_ns()
+        if self.bounded_load > 0:
+            owners = {k: self._bounded(k, self.replication, True) for k in keys}
+        else:
+            owners = {k: self.ring.get_n(k, self.replication) for k in keys}
+        METRICS.observe("ring", "get_many", time.perf_counter_ns() - t0)
+        pending = list(owners)
+
+        for rank in range(max(map(len, owners.values()), default=0)):
+            batches: Dict[str, List[str]] = defaultdict(list)
+            for key in pending:
+                if rank < len(owners[key]):
+                    batches[owners[key][rank]].append(key)
+            if not batches:
+                break
+
+            results = self._fan_out(
+                lambda pid, b: self.peer(pid).get_many_items(b), batches
+            )
+            for hits in results.values():
+                found.update(hits)
+
+            pending = [k for k in pending if k not in found]
+            if not pending:
+                break
+
+        return found
+
+    # ------------------------------------------------------------------ #
+    # Chunking
+    # ------------------------------------------------------------------ #
+    def _split(
+        self, key: str, item: Item, batches: Dict[str, Dict[str, Item]]
+    ) -> Item:
+        """
+        Add *item*'s chunks to the per-peer *batches* (each chunk placed on
+        the ring by ``key#i``) and return the manifest to store under *key*.
+        """
+        manifest, chunks = split_chunks(item, self.chunk_size)
+        for i, chunk in enumerate(chunks):
+            ckey = chunk_key(key, i)
+            for pid in self.ring.get_n(ckey, self.replication):
+                batches[pid][ckey] = Item(chunk, FLAG_BYTES)
+        return manifest.to_item()
+
+    def _join(self, manifests: Dict[str, Item]) -> Dict[str, Item]:
+        """
+        Fetch every chunk named by *manifests* in one parallel batch and
+        reassemble them; keys with any missing chunk are left out (a miss).
+        """
+        parsed = {key: Manifest.from_item(item) for key, item in manifests.items()}
+        chunks = self._get_items(
+            chunk_key(key, i) for key, m in parsed.items() for i in range(m.chunks)
+        )
+        joined: Dict[str, Item] = {}
+        for key, m in parsed.items():
+            parts = [chunks.get(chunk_key(key, i)) for i in range(m.chunks)]
+            item = join_chunks(m, parts)
+            if item is not None:
+                joined[key] = item
+        return joined
 
     def stats(self) -> str:
+        with self._stats_lock:
+            lines = [
+                f"  {pid}: {c['acks']} acks, {c['errors']} errors, "
+                f"{c['timeouts']} timeouts"
+                for pid, c in sorted(self.write_stats.items())
+            ]
+        extra = ("\nWrites :\n" + "\n".join(lines)) if lines else ""
+        if self.hedge_reads:
+            delay = (
+                f"{self.hedge_delay_ms}ms" if self.hedge_delay_ms is not None else "p95"
+            )
+            extra += (
+                f"\nHedging: {delay} | sent {self.hedge_stats['sent']} "
+                f"| won {self.hedge_stats['won']}"
+            )
+        if self.l1 is not None:
+            l1 = self.l1.stats
+            extra += (
+                f"\nL1     : {self.l1.bytes}/{self.l1_bytes} bytes "
+                f"| TTL {self.l1_ttl}s | hits {l1['hits']} | misses {l1['misses']} "
+                f"| evictions {l1['evictions']}"
+            )
+        if self.hot_threshold:
+            hot = ", ".join(self.hot_keys[:10]) or "None"
+            if len(self.hot_keys) > 10:
+                hot += f" (+{len(self.hot_keys) - 10} more)"
+            load = ", ".join(f"{p} {self.peer_load.get(p, 0)}" for p in self.peers)
+            extra += (
+                f"\nHot    : {hot} (threshold {self.hot_threshold}, "
+                f"+{self.hot_extra} replicas)"
+                f"\nLoad   : skew {self.load_skew():.2f} | {load}"
+            )
+        if len(set(self._vnode_weights().values())) > 1:
+            weights = ", ".join(
+                f"{pid} {self.weights.get(pid, DEFAULT_MEMORY_MB):g} "
+                f"({self.ring.share(pid)})"
+                for pid in self.peers
+            )
+            extra += f"\nWeights: {weights}"
+        if self.bounded_load:
+            extra += f"\nBounded: {1 + self.bounded_load:g}x mean in-flight load"
         return (
             f"Network: {self.name}\n"
             f"Peers  : {', '.join(self.peers) if self.peers else 'None'}\n"
             f"Write  : {self.write}\n"
-            f"Replicas: {self.replication} | VNodes: {self.vnodes}"
+            f"Replicas: {self.replication} | VNodes: {self.vnodes} "
+            f"| Hash: {self.hash_fn}\n"
+            f"Placing: {self.placement}, {len(self.ring)} {self.ring.unit} "
+            f"| {self.ring.memory_usage()['total'] / 1024:.1f} KiB\n"
+            f"Quorum : {self.write_quorum or self.replication} "
+            f"| Timeout: {self.write_timeout}s"
+            f"{extra}"
         )
 
     def __str__(self) -> str:
@@ -1,15 +1,31 @@
 import json
+import os
+import signal
 import socket
 import subprocess
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional
-import threading
-from functools import lru_cache
+from urllib.parse import unquote
+from typing import Dict, Any, ContextManager, List, Optional
 from pymemcache.client.base import Client
 
+from peercache.core.codec import Item
+from peercache.core.metrics import METRICS
 from peercache.settings.settings import SETTINGS
 from peercache.parser.registry import add as _reg_add, remove as _reg_rm
+from peercache.parser.pool import DEAD_CONNECTION_ERRORS, close_pool, get_pool
+from peercache.server.memcached import start_in_process, stop_in_process
+
+# Ways to run a peer's server: the memcached binary, the bundled stand-in as
+# a subprocess, the stand-in on a thread of this process, or that in-process
+# stand-in in null mode (writes discarded, every read a miss).
+BACKENDS = ("memcached", "python", "inprocess", "null")
+
+# Server memory when start() isn't told otherwise; also the capacity assumed
+# for peers whose state file predates recording it.
+DEFAULT_MEMORY_MB = 64
 
 
 class Peer:
@@ -19,9 +35,16 @@ class Peer:
 
     def __init__(self, peer_id: str, port: int | None = None):
         self.id = peer_id
-        self.port = port if port is not None else self._find_free_port()
+        self.port = port
         self.path: Path = Path(SETTINGS.PEER_FOLDER_PATH) / f"{self.id}.json"
         self.pid: Optional[int] = None  # populated on start()
+        self.backend = "memcached"
+        self.memory_mb: Optional[int] = None  # populated on start()
+        # Calls currently waiting on this peer (read by bounded-load placement).
+        self.inflight = 0
+        self._inflight_lock = threading.Lock()
+        # mtime of the state file this object was loaded from or last wrote.
+        self._mtime: Optional[float] = None
         self._load_or_init()
 
     @staticmethod
@@ -41,7 +64,14 @@ class Peer:
             data = json.loads(self.path.read_text())
             self.port = data["port"]
             self.pid = data.get("pid")
+            self.backend = data.get("backend", self.backend)
+            self.memory_mb = data.get("memory_mb")
+            self._mtime = self.path.stat().st_mtime
         else:
+            # Only probe for a port when the peer is genuinely new; known peers
+            # already have one recorded in their state file.
+            if self.port is None:
+                self.port = self._find_free_port()
             if self.port == 0:
                 raise ValueError("Port must be supplied for new peer")
             self._persist()
@@ -51,59 +81,220 @@ class Peer:
         payload = {"id": self.id, "port": self.port}
         if self.pid:
             payload["pid"] = self.pid
+        if self.backend != "memcached":
+            payload["backend"] = self.backend
+        if self.memory_mb is not None:
+            payload["memory_mb"] = self.memory_mb
         self.path.write_text(json.dumps(payload, indent=2))
+        self._mtime = self.path.stat().st_mtime
+
+    def _reresolve(self) -> None:
+        """Re-read the state file if another process rewrote it (restart)."""
+        try:
+            mtime = self.path.stat().st_mtime
+            if mtime == self._mtime:
+                return
+            data = json.loads(self.path.read_text())
+            self.port = data["port"]
+            self.pid = data.get("pid")
+            self._mtime = mtime
+        except (OSError, ValueError, KeyError):
+            pass
 
-    def start(self, memory_mb: int = 64) -> str:
+    def start(
+        self, memory_mb: int = DEFAULT_MEMORY_MB, backend: str = "memcached"
+    ) -> str:
         """
-        Launch memcached, register the peer once confirmed alive.
+        Launch the peer's server, register the peer once confirmed alive.
+
+        ``backend`` is one of ``BACKENDS``; the stand-in backends need no
+        memcached binary, and ``inprocess``/``null`` live only as long as
+        this process.
         """
-        proc = subprocess.Popen(
-            ["memcached", "-d", "-m", str(memory_mb), "-p", str(self.port)],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'; use one of {BACKENDS}")
+        self.backend = backend
+        self.memory_mb = memory_mb
+        proc = None
+        if backend in ("inprocess", "null"):
+            self.pid = start_in_process(self.port, memory_mb, null=backend == "null")
+        else:
+            if backend == "python":
+                cmd = [sys.executable, "-m", "peercache.server.memcached"]
+            else:
+                cmd = ["memcached", "-d"]
+            proc = subprocess.Popen(
+                cmd + ["-m", str(memory_mb), "-p", str(self.port)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=_subprocess_env(),
+            )
+            self.pid = proc.pid
 
         deadline = time.time() + 5
-        self.pid = proc.pid
-        client = self._client()
-
         while time.time() < deadline:
             try:
-                client.stats()
+                self.stats()
                 self._persist()
                 _reg_add(self.id)
                 return f"Peer {self.id} running on :{self.port}"
             except Exception:
                 time.sleep(0.1)
 
-        proc.terminate()
+        if proc is not None:
+            proc.terminate()
         raise RuntimeError(f"Failed to start peer {self.id} on :{self.port}")
 
     def stop(self) -> str:
         """
         Terminate the daemon and unregister the peer.
         """
-        _get_client.cache_clear()
+        close_pool(self.port)
+        if self.backend in ("inprocess", "null"):
+            stop_in_process(self.port)
+        elif self.backend == "python" and self.pid:
+            try:
+                os.kill(self.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
         return f"Peer {self.id} stopped."
 
     # ------------------------------------------------------------------ #
     # Cache operations
     # ------------------------------------------------------------------ #
-    def _client(self) -> Client:
+    def connection(self) -> ContextManager[Client]:
+        """
+        Check a client out of this port's bounded pool for a ``with`` block.
+        """
+        return get_pool(self.port).connection()
+
+    def pool_stats(self) -> Dict[str, float]:
+        """In-use/idle/created counts and checkout wait time for this port."""
+        return get_pool(self.port).stats()
+
+    def _call(self, op: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run one client call on a pooled connection. A dead connection is
+        discarded by the pool and the call is retried once on a fresh one,
+        after re-reading the state file in case the peer restarted elsewhere.
+        Pool checkout and round-trip time are recorded per peer and op, and
+        ``inflight`` counts the call while it runs.
+        """
+        with self._inflight_lock:
+            self.inflight += 1
+        try:
+            return self._call_once(op, *args, **kwargs)
+        finally:
+            with self._inflight_lock:
+                self.inflight -= 1
+
+    def _call_once(self, op: str, *args: Any, **kwargs: Any) -> Any:
+        for attempt in range(2):
+            start = time.perf_counter_ns()
+            try:
+                with self.connection() as client:
+                    acquired = time.perf_counter_ns()
+                    result = getattr(client, op)(*args, **kwargs)
+            except DEAD_CONNECTION_ERRORS:
+                labels = (("op", op), ("peer", self.id))
+                METRICS.inc("peercache_peer_errors_total", labels)
+                if attempt:
+                    raise
+                self._reresolve()
+                continue
+            done = time.perf_counter_ns()
+            METRICS.observe("acquire", op, acquired - start, self.id)
+            METRICS.observe("rtt", op, done - acquired, self.id)
+            return result
+
+    def set(self, key: str, value: Any, expire: int = 0) -> bool:
         """
-        Return a *thread-local* cached Client so we don’t open thousands of
-        sockets.  One (thread, port) → one TCP connection.
+        Store *value*; an ``Item`` is written with its own flags. Returns
+        whether the server replied STORED.
         """
-        return _get_client(threading.get_ident(), self.port)
+        return self._call("set", key, value, expire=expire)
 
-    def set(self, key: str, value: str) -> None:
-        self._client().set(key, value)
+    def add(self, key: str, value: Any, expire: int = 0) -> bool:
+        """Store *value* only if *key* is absent; returns whether it was."""
+        return self._call("add", key, value, expire=expire)
+
+    def ttl(self, key: str) -> Optional[int]:
+        """
+        Remaining TTL of *key* in seconds via the meta protocol (``mg <key>
+        t``, memcached 1.6+): -1 if it never expires, ``None`` if missing.
+        """
+        reply = self._call("raw_command", f"mg {key} t")
+        if not reply.startswith(b"HD"):
+            return None
+        for token in reply.split()[1:]:
+            if token.startswith(b"t"):
+                return int(token[1:])
+        return None
 
     def get(self, key: str) -> Optional[bytes]:
-        return self._client().get(key)
+        item = self.get_item(key)
+        return item.value if item is not None else None
+
+    def get_item(self, key: str) -> Optional[Item]:
+        """Fetch *key* together with its memcached flags."""
+        return self._call("get", key)
+
+    def set_many(self, mapping: Dict[str, Any], expire: int = 0) -> List[str]:
+        """Store every item in one round trip; return the keys that failed."""
+        return self._call("set_many", mapping, expire=expire)
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Fetch *keys* in one round trip; missing keys are absent."""
+        return {k: item.value for k, item in self.get_many_items(keys).items()}
+
+    def get_many_items(self, keys: List[str]) -> Dict[str, Item]:
+        """Like ``get_many`` but keeps each value's memcached flags."""
+        return self._call("get_many", keys)
+
+    def delete_many(self, keys: List[str]) -> None:
+        self._call("delete_many", keys)
+
+    def metadump(self) -> List[Dict[str, str]]:
+        """
+        Return every item's metadata via ``lru_crawler metadump all``.
+
+        Each entry carries at least ``key`` (URL-decoded), ``exp`` (absolute
+        unix time, -1 for no expiry) and ``size``.
+        """
+        raw = self._read_dump(b"lru_crawler metadump all\r\n")
+        items = []
+        for line in raw.decode().splitlines():
+            fields = dict(f.split("=", 1) for f in line.split() if "=" in f)
+            if "key" in fields:
+                fields["key"] = unquote(fields["key"])
+                items.append(fields)
+        return items
+
+    def _read_dump(self, command: bytes) -> bytes:
+        """
+        Send an admin command on a dedicated socket and read up to ``END``.
+
+        pymemcache's ``raw_command`` drops all but the last recv() buffer when
+        a reply spans several packets, which truncates any real dump.
+        """
+        with socket.create_connection(("localhost", self.port), timeout=5) as sock:
+            sock.sendall(command)
+            chunks: List[bytes] = []
+            tail = b""
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    raise ConnectionError(f"Peer {self.id} closed during dump")
+                chunks.append(data)
+                tail = (tail + data)[-7:]
+                if tail.endswith(b"END\r\n"):
+                    return b"".join(chunks)[:-5]
+                if tail.endswith(b"ERROR\r\n"):
+                    raise RuntimeError(f"Peer {self.id} rejected {command!r}")
 
-    def stats(self) -> Dict[str, Any]:
-        raw = self._client().stats()
+    def stats(self, *args: str) -> Dict[str, Any]:
+        """``stats`` (or e.g. ``stats("slabs")``) with keys and values as str."""
+        raw = self._call("stats", *args)
         return {
             (k.decode() if isinstance(k, bytes) else k): (
                 v.decode() if isinstance(v, bytes) else v
@@ -112,12 +303,9 @@ class Peer:
         }
 
 
-@lru_cache(maxsize=None)
-def _get_client(thread_id: int, port: int) -> Client:
-    """Return a single pymemcache.Client per (thread, port) tuple."""
-    return Client(
-        ("localhost", port),
-        connect_timeout=0.2,
-        timeout=1.0,
-        no_delay=True,
-    )
\ No newline at end of file
+def _subprocess_env() -> Dict[str, str]:
+    """Environment for server subprocesses, with this package importable."""
+    env = dict(os.environ)
+    root = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    return env
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+from pymemcache.client.base import Client
+from pymemcache.exceptions import MemcacheUnexpectedCloseError
+
+from peercache.core.codec import Item
+from peercache.core.metrics import METRICS, Gauge
+
+# Errors that mean the socket is unusable; the client is discarded, not reused.
+# OSError covers ConnectionError and socket timeouts.
+DEAD_CONNECTION_ERRORS = (MemcacheUnexpectedCloseError, OSError)
+
+
+class PoolTimeout(Exception):
+    """
+    No client could be checked out in time. Deliberately not an ``OSError``:
+    an exhausted pool is not a dead connection and must not be retried.
+    """
+
+
+class _ItemSerde:
+    """
+    Keep memcached flags visible to callers: reads come back as ``Item``s and
+    ``Item`` values are written with their own flags (other values use 0).
+    """
+
+    def serialize(self, key: bytes, value: Any) -> Tuple[Any, int]:
+        if isinstance(value, Item):
+            return value.value, value.flags
+        return value, 0
+
+    def deserialize(self, key: bytes, value: bytes, flags: int) -> Item:
+        return Item(value, flags)
+
+
+_SERDE = _ItemSerde()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of pymemcache clients for one memcached port.
+
+    Clients are checked out for exclusive use and checked back in afterwards.
+    Idle clients older than ``idle_timeout`` are closed, and a client that
+    fails with a connection error is dropped so the next checkout reconnects.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        host: str = "localhost",
+        max_size: int = 16,
+        idle_timeout: float = 30.0,
+        checkout_timeout: float = 1.0,
+    ) -> None:
+        self.port = port
+        self.host = host
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+
+        # (client, last checkin time), most recently used last.
+        self._idle: List[Tuple[Client, float]] = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._next_reap = time.monotonic() + idle_timeout
+        self._stats: Dict[str, float] = {
+            "created": 0,
+            "discarded": 0,
+            "reaped": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+        }
+
+    def _create(self) -> Client:
+        self._stats["created"] += 1
+        return Client(
+            (self.host, self.port),
+            serde=_SERDE,
+            connect_timeout=0.2,
+            timeout=1.0,
+            no_delay=True,
+            # Wait for STORED/NOT_STORED so write quorums count real acks.
+            default_noreply=False,
+        )
+
+    @contextmanager
+    def connection(self) -> Iterator[Client]:
+        """Check a client out for the duration of the ``with`` block."""
+        client = self.checkout()
+        try:
+            yield client
+        except DEAD_CONNECTION_ERRORS:
+            self.discard(client)
+            raise
+        except BaseException:
+            self.checkin(client)
+            raise
+        else:
+            self.checkin(client)
+
+    def checkout(self) -> Client:
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        with self._cond:
+            waited = False
+            while True:
+                now = time.monotonic()
+                if now >= self._next_reap:
+                    self._reap_locked(now)
+                if self._idle:
+                    client, _ = self._idle.pop()
+                    break
+                if self._in_use < self.max_size:
+                    client = self._create()
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"No connection to :{self.port} free within "
+                        f"{self.checkout_timeout}s"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += time.monotonic() - start
+        return client
+
+    def checkin(self, client: Client) -> None:
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((client, time.monotonic()))
+            self._cond.notify()
+
+    def discard(self, client: Client) -> None:
+        """
+        Close a broken client instead of returning it to the pool.
+
+        Idle clients are closed too: a dead connection usually means the
+        daemon restarted, so every socket opened before it is stale.
+        """
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._in_use -= 1
+            self._stats["discarded"] += 1 + len(idle)
+            self._cond.notify_all()
+        _quiet_close(client)
+        for stale, _ in idle:
+            _quiet_close(stale)
+
+    def _reap_locked(self, now: float) -> None:
+        cutoff = now - self.idle_timeout
+        stale = [c for c, used in self._idle if used < cutoff]
+        if stale:
+            self._idle = [(c, used) for c, used in self._idle if used >= cutoff]
+            self._stats["reaped"] += len(stale)
+            for client in stale:
+                _quiet_close(client)
+        self._next_reap = now + self.idle_timeout / 2
+
+    def close(self) -> None:
+        """Close every idle client; checked-out clients close on discard."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for client, _ in idle:
+            _quiet_close(client)
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                **self._stats,
+            }
+
+
+def _quiet_close(client: Client) -> None:
+    try:
+        client.close()
+    except Exception:
+        pass
+
+
+_POOLS: Dict[int, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(port: int) -> ConnectionPool:
+    """Return the process-wide pool for *port*, creating it on first use."""
+    pool = _POOLS.get(port)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(port)
+            if pool is None:
+                pool = _POOLS[port] = ConnectionPool(port)
+    return pool
+
+
+def _forget_pools_after_fork() -> None:
+    # A forked child shares the parent's sockets; replies would interleave.
+    global _POOLS_LOCK
+    _POOLS.clear()
+    _POOLS_LOCK = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+def _pool_gauges() -> List[Gauge]:
+    gauges = []
+    for port, pool in sorted(_POOLS.items()):
+        labels = (("port", str(port)),)
+        for name, value in pool.stats().items():
+            gauges.append((f"peercache_pool_{name}", labels, value))
+    return gauges
+
+
+METRICS.add_collector(_pool_gauges)
+
+
+def close_pool(port: int) -> None:
+    """Close and forget the pool for *port* (e.g. when its peer stops)."""
+    with _POOLS_LOCK:
+        pool = _POOLS.pop(port, None)
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,110 @@
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from peercache.core.codec import Item
+from peercache.parser.network import Network
+from peercache.parser.peer import Peer
+
+
+class Rebalancer:
+    """
+    Copies items whose owners changed after a membership change to their new
+    peers, so moved keys don't turn into cold misses.
+
+    Every source peer is enumerated with ``lru_crawler metadump``; each key is
+    re-placed with the network's ring and, if the source no longer owns it,
+    copied in batches to its current replicas with the remaining TTL kept.
+    """
+
+    def __init__(
+        self,
+        network: Network,
+        bytes_per_sec: Optional[float] = None,
+        batch_size: int = 100,
+        delete_source: bool = False,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    ) -> None:
+        self.network = network
+        self.bytes_per_sec = bytes_per_sec
+        self.batch_size = batch_size
+        self.delete_source = delete_source
+        self.progress = progress
+        self.stats: Dict[str, int] = {
+            "scanned": 0,
+            "moved": 0,
+            "copied": 0,
+            "expired": 0,
+            "missing": 0,
+            "bytes": 0,
+        }
+        self._started = 0.0
+
+    def run(self, sources: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Rebalance keys held by *sources* (default: every peer in the network).
+
+        Pass a just-removed peer explicitly to drain it while it is still up.
+        """
+        self._started = time.monotonic()
+        for pid in list(sources) if sources is not None else list(self.network.peers):
+            self._drain(self.network.peer(pid))
+        return self.stats
+
+    def _drain(self, source: Peer) -> None:
+        ring = self.network.ring
+        replication = self.network.replication
+        batch: List[Tuple[str, int]] = []
+
+        for item in source.metadump():
+            self.stats["scanned"] += 1
+            key = item["key"]
+            if source.id in ring.get_n(key, replication):
+                continue
+            exp = int(item.get("exp", -1))
+            if exp != -1 and exp <= time.time():
+                self.stats["expired"] += 1
+                continue
+            batch.append((key, exp))
+            if len(batch) >= self.batch_size:
+                self._copy(source, batch)
+                batch = []
+
+        if batch:
+            self._copy(source, batch)
+
+    def _copy(self, source: Peer, batch: List[Tuple[str, int]]) -> None:
+        values = source.get_many_items([key for key, _ in batch])
+        now = time.time()
+
+        # Group by (destination, remaining TTL) so each group is one set_many.
+        groups: Dict[Tuple[str, int], Dict[str, Item]] = defaultdict(dict)
+        for key, exp in batch:
+            if key not in values:
+                self.stats["missing"] += 1
+                continue
+            expire = 0 if exp == -1 else max(1, int(exp - now + 0.999))
+            for pid in self.network.ring.get_n(key, self.network.replication):
+                groups[(pid, expire)][key] = values[key]
+            self.stats["moved"] += 1
+            self.stats["bytes"] += len(values[key].value)
+
+        for (pid, expire), items in groups.items():
+            self.network.peer(pid).set_many(items, expire=expire)
+            self.stats["copied"] += len(items)
+
+        if self.delete_source and values:
+            source.delete_many(list(values))
+
+        self._throttle()
+        if self.progress is not None:
+            self.progress(dict(self.stats))
+
+    def _throttle(self) -> None:
+        """Sleep until the copied bytes fit the configured bytes/sec budget."""
+        if not self.bytes_per_sec:
+            return
+        due = self.stats["bytes"] / self.bytes_per_sec
+        elapsed = time.monotonic() - self._started
+        if due > elapsed:
+            time.sleep(due - elapsed)
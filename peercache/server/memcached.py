@@ -0,0 +1,320 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+# memcached treats expiry values above 30 days as absolute unix times.
+_RELATIVE_EXPIRY_LIMIT = 60 * 60 * 24 * 30
+
+# Approximate per-item overhead counted against the byte limit.
+_ITEM_OVERHEAD = 48
+
+
+class MemcachedServer:
+    """
+    Lightweight asyncio server speaking the memcached text protocol.
+
+    Supports ``get``/``gets`` (multi-key), ``set``, ``add``, ``delete``,
+    ``touch``, ``mg`` (the ``t`` flag only), ``stats``, ``flush_all``,
+    ``version``, ``quit`` and ``lru_crawler metadump``, with TTLs and an LRU byte limit. In ``null`` mode writes are
+    acknowledged and discarded and every read misses, which leaves only the
+    client path and the socket round trip to measure.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        host: str = "localhost",
+        memory_mb: int = 64,
+        null: bool = False,
+    ) -> None:
+        self.port = port
+        self.host = host
+        self.limit = memory_mb * 1024 * 1024
+        self.null = null
+        # key -> (data, flags, expires_at or 0), least recently used first.
+        self._items: "OrderedDict[str, Tuple[bytes, int, float]]" = OrderedDict()
+        self.bytes = 0
+        self.started = time.time()
+        self.counters: Dict[str, int] = {
+            "cmd_get": 0,
+            "cmd_set": 0,
+            "get_hits": 0,
+            "get_misses": 0,
+            "evictions": 0,
+            "expired_unfetched": 0,
+            "total_connections": 0,
+            "curr_connections": 0,
+        }
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ #
+    # Storage
+    # ------------------------------------------------------------------ #
+    def _lookup(self, key: str) -> Optional[Tuple[bytes, int, float]]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[2] and item[2] <= time.time():
+            self._drop(key)
+            self.counters["expired_unfetched"] += 1
+            return None
+        self._items.move_to_end(key)
+        return item
+
+    def _store(self, key: str, data: bytes, flags: int, exptime: int) -> None:
+        if self.null:
+            return
+        if exptime < 0:
+            self._drop(key)
+            return
+        if exptime and exptime <= _RELATIVE_EXPIRY_LIMIT:
+            exptime += time.time()
+        self._drop(key)
+        self._items[key] = (data, flags, float(exptime))
+        self.bytes += len(key) + len(data) + _ITEM_OVERHEAD
+        while self.bytes > self.limit and self._items:
+            old_key = next(iter(self._items))
+            self._drop(old_key)
+            self.counters["evictions"] += 1
+
+    def _drop(self, key: str) -> bool:
+        item = self._items.pop(key, None)
+        if item is None:
+            return False
+        self.bytes -= len(key) + len(item[0]) + _ITEM_OVERHEAD
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Protocol
+    # ------------------------------------------------------------------ #
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.counters["total_connections"] += 1
+        self.counters["curr_connections"] += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.split()
+                if not parts:
+                    continue
+                cmd = parts[0]
+                if cmd in (b"set", b"add"):
+                    reply = await self._set(reader, parts)
+                else:
+                    reply = self._dispatch(cmd, parts)
+                if reply is None:  # quit
+                    break
+                if reply:
+                    writer.write(reply)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Shutdown; finish normally so asyncio doesn't log the handler.
+            pass
+        finally:
+            self.counters["curr_connections"] -= 1
+            writer.close()
+
+    async def _set(self, reader: asyncio.StreamReader, parts: List[bytes]) -> bytes:
+        key, flags, exptime, size = parts[1], parts[2], parts[3], parts[4]
+        data = (await reader.readexactly(int(size) + 2))[:-2]
+        self.counters["cmd_set"] += 1
+        if parts[0] == b"add" and self._lookup(key.decode()) is not None:
+            reply = b"NOT_STORED\r\n"
+        else:
+            self._store(key.decode(), data, int(flags), int(exptime))
+            reply = b"STORED\r\n"
+        return b"" if parts[-1] == b"noreply" else reply
+
+    def _dispatch(self, cmd: bytes, parts: List[bytes]) -> Optional[bytes]:
+        noreply = parts[-1] == b"noreply"
+        if cmd in (b"get", b"gets"):
+            out = []
+            for raw in parts[1:]:
+                self.counters["cmd_get"] += 1
+                item = self._lookup(raw.decode())
+                if item is None:
+                    self.counters["get_misses"] += 1
+                    continue
+                self.counters["get_hits"] += 1
+                data, flags, _ = item
+                cas = b" 0" if cmd == b"gets" else b""
+                header = b"VALUE %s %d %d%s\r\n" % (raw, flags, len(data), cas)
+                out.append(header + data + b"\r\n")
+            out.append(b"END\r\n")
+            return b"".join(out)
+        if cmd == b"delete":
+            found = self._drop(parts[1].decode())
+            if noreply:
+                return b""
+            return b"DELETED\r\n" if found else b"NOT_FOUND\r\n"
+        if cmd == b"mg":
+            item = self._lookup(parts[1].decode())
+            if item is None:
+                return b"EN\r\n"
+            if b"t" not in parts[2:]:
+                return b"HD\r\n"
+            ttl = int(item[2] - time.time()) if item[2] else -1
+            return b"HD t%d\r\n" % ttl
+        if cmd == b"touch":
+            key = parts[1].decode()
+            item = self._lookup(key)
+            if item is not None:
+                self._store(key, item[0], item[1], int(parts[2]))
+            if noreply:
+                return b""
+            return b"TOUCHED\r\n" if item else b"NOT_FOUND\r\n"
+        if cmd == b"stats":
+            if parts[1:2] == [b"slabs"]:
+                return self._slabs()
+            return self._stats()
+        if cmd == b"flush_all":
+            self._items.clear()
+            self.bytes = 0
+            return b"" if noreply else b"OK\r\n"
+        if cmd == b"lru_crawler" and parts[1:2] == [b"metadump"]:
+            return self._metadump()
+        if cmd == b"version":
+            return b"VERSION peercache-stub\r\n"
+        if cmd == b"quit":
+            return None
+        return b"ERROR\r\n"
+
+    def _stats(self) -> bytes:
+        stats = {
+            "pid": os.getpid(),
+            "uptime": int(time.time() - self.started),
+            "time": int(time.time()),
+            "curr_items": len(self._items),
+            "bytes": self.bytes,
+            "limit_maxbytes": self.limit,
+            **self.counters,
+        }
+        lines = [f"STAT {k} {v}\r\n" for k, v in stats.items()]
+        return ("".join(lines) + "END\r\n").encode()
+
+    def _slabs(self) -> bytes:
+        # No slab allocator here: report everything as one class.
+        stats = {
+            "1:chunk_size": 0,
+            "1:total_chunks": len(self._items),
+            "1:used_chunks": len(self._items),
+            "1:mem_requested": self.bytes,
+            "active_slabs": 1 if self._items else 0,
+            "total_malloced": self.bytes,
+        }
+        lines = [f"STAT {k} {v}\r\n" for k, v in stats.items()]
+        return ("".join(lines) + "END\r\n").encode()
+
+    def _metadump(self) -> bytes:
+        now = time.time()
+        lines = [
+            f"key={quote(key)} exp={int(exp) if exp else -1} la=0 cas=0 "
+            f"fetch=no cls=1 size={len(data)}\r\n"
+            for key, (data, _flags, exp) in self._items.items()
+            if not exp or exp > now
+        ]
+        return ("".join(lines) + "END\r\n").encode()
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    async def serve(self) -> None:
+        """Listen until cancelled."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "MemcachedServer":
+        """Run the server on its own event loop in a daemon thread."""
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def _run() -> None:
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port)
+                )
+            except BaseException as exc:
+                errors.append(exc)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._server.close()
+            # Open client connections still have handlers parked in readline.
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:  # gather() with no tasks needs a current loop
+                self._loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(
+            target=_run, name=f"memcached-stub-{self.port}", daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_RUNNING: Dict[int, MemcachedServer] = {}
+
+
+def start_in_process(port: int, memory_mb: int = 64, null: bool = False) -> int:
+    """Start (or reuse) an in-process server on *port*; returns this pid."""
+    if port not in _RUNNING:
+        _RUNNING[port] = MemcachedServer(
+            port, memory_mb=memory_mb, null=null
+        ).start_in_thread()
+    return os.getpid()
+
+
+def stop_in_process(port: int) -> bool:
+    """Stop the in-process server on *port*, if this process runs one."""
+    server = _RUNNING.pop(port, None)
+    if server is None:
+        return False
+    server.stop()
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="memcached stand-in server")
+    parser.add_argument("-p", "--port", type=int, default=11211)
+    parser.add_argument("-l", "--host", default="localhost")
+    parser.add_argument("-m", "--memory-mb", type=int, default=64)
+    parser.add_argument("--null", action="store_true", help="discard all writes")
+    args = parser.parse_args()
+    server = MemcachedServer(args.port, args.host, args.memory_mb, args.null)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
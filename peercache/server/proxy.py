@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from peercache.core.codec import Item
+from peercache.parser.async_network import AsyncNetwork
+
+# memcached's own key length limit.
+_MAX_KEY = 250
+
+# Commands sent to every replica of their key; they accept ``noreply``.
+_UPDATES = (b"set", b"delete", b"touch")
+
+_BAD_FORMAT = b"CLIENT_ERROR bad command line format\r\n"
+
+
+def _number(field: bytes) -> Optional[int]:
+    """An integer protocol field (flags, exptime), or ``None`` if malformed."""
+    try:
+        return int(field)
+    except ValueError:
+        return None
+
+
+class MemcachedProxy:
+    """
+    memcached text-protocol proxy that routes by a network's placement.
+
+    Clients speak plain memcached to one port; every key is placed with the
+    network's placement (``Network.ring``) and ``replication`` exactly as
+    ``Network`` does. Multi-key ``get``s are split per owning peer, fetched
+    concurrently (misses retried on the next replica) and reassembled in
+    request order; chunked values are joined before they are returned.
+    ``set``/``delete``/``touch`` go to every replica, and a ``set`` answers
+    ``STORED`` once the network's write quorum acknowledged it.
+
+    Backends are reached over ``connections`` pipelined ``AsyncPeer``
+    connections per peer, shared by all clients. Each client's requests are
+    answered in order, one at a time. The ring is reloaded whenever
+    ``state/network/<name>.json`` changes.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        port: int = 11311,
+        host: str = "localhost",
+        connections: int = 2,
+        timeout: float = 1.0,
+        reload_interval: float = 1.0,
+    ) -> None:
+        self.net = AsyncNetwork(network, timeout, connections)
+        self.port = port
+        self.host = host
+        self.reload_interval = reload_interval
+        self.started = time.time()
+        self.counters: Dict[str, int] = {
+            "cmd_get": 0,
+            "cmd_set": 0,
+            "get_hits": 0,
+            "get_misses": 0,
+            "backend_errors": 0,
+            "ring_reloads": 0,
+            "total_connections": 0,
+            "curr_connections": 0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Client side
+    # ------------------------------------------------------------------ #
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.counters["total_connections"] += 1
+        self.counters["curr_connections"] += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.split()
+                if not parts:
+                    continue
+                cmd = parts[0]
+                if cmd == b"quit":
+                    break
+                data = None
+                if cmd == b"set":
+                    if len(parts) < 5 or not parts[4].isdigit():
+                        writer.write(_BAD_FORMAT)
+                        continue
+                    data = (await reader.readexactly(int(parts[4]) + 2))[:-2]
+                try:
+                    reply = await self._execute(cmd, parts, data)
+                except Exception as exc:
+                    self.counters["backend_errors"] += 1
+                    reply = f"SERVER_ERROR {exc}\r\n".encode()
+                if reply and not (cmd in _UPDATES and parts[-1] == b"noreply"):
+                    writer.write(reply)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.counters["curr_connections"] -= 1
+            writer.close()
+
+    async def _execute(self, cmd: bytes, parts: List[bytes], data: Optional[bytes]):
+        if cmd in (b"get", b"gets"):
+            return await self._get(parts[1:], cas=cmd == b"gets")
+        if cmd == b"version":
+            return b"VERSION peercache-proxy\r\n"
+        if cmd == b"stats":
+            return self._stats()
+        if cmd not in _UPDATES:
+            return b"ERROR\r\n"
+        if len(parts) < 2 or len(parts[1]) > _MAX_KEY:
+            return _BAD_FORMAT
+        if cmd == b"set":
+            flags, expire = _number(parts[2]), _number(parts[3])
+            if flags is None or expire is None or flags < 0:
+                return _BAD_FORMAT
+        elif cmd == b"touch":
+            expire = _number(parts[2]) if len(parts) > 2 else None
+            if expire is None:
+                return _BAD_FORMAT
+        if not self.net.network.peers:
+            return b"SERVER_ERROR no peers available\r\n"
+
+        key = parts[1].decode()
+        targets = self.net.ring.get_n(key, self.net.replication)
+        if cmd == b"set":
+            self.counters["cmd_set"] += 1
+            item = Item(data, flags)
+            calls = [self.net.peer(pid).set(key, item, expire) for pid in targets]
+        elif cmd == b"delete":
+            calls = [self.net.peer(pid).delete(key) for pid in targets]
+        else:
+            calls = [self.net.peer(pid).touch(key, expire) for pid in targets]
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        self.counters["backend_errors"] += len(errors)
+        acks = sum(r is True for r in results)
+
+        if cmd == b"set":
+            quorum = min(self.net.network.write_quorum or len(targets), len(targets))
+            if acks >= quorum:
+                return b"STORED\r\n"
+            reply = f"SERVER_ERROR stored on {acks}/{len(targets)} replicas\r\n"
+            return reply.encode()
+        if len(errors) == len(results):
+            return f"SERVER_ERROR {errors[0]}\r\n".encode()
+        if acks:
+            return b"DELETED\r\n" if cmd == b"delete" else b"TOUCHED\r\n"
+        return b"NOT_FOUND\r\n"
+
+    async def _get(self, raw_keys: List[bytes], cas: bool) -> bytes:
+        if not raw_keys or any(len(k) > _MAX_KEY for k in raw_keys):
+            return _BAD_FORMAT
+        if not self.net.network.peers:
+            return b"SERVER_ERROR no peers available\r\n"
+        keys = [k.decode() for k in raw_keys]
+        items = await self.net.get_many_items(keys)
+
+        self.counters["cmd_get"] += len(keys)
+        out = []
+        for raw, key in zip(raw_keys, keys):
+            item = items.get(key)
+            if item is None:
+                self.counters["get_misses"] += 1
+                continue
+            self.counters["get_hits"] += 1
+            suffix = b" 0" if cas else b""
+            out.append(
+                b"VALUE %s %d %d%s\r\n" % (raw, item.flags, len(item.value), suffix)
+                + item.value
+                + b"\r\n"
+            )
+        out.append(b"END\r\n")
+        return b"".join(out)
+
+    def _stats(self) -> bytes:
+        stats = {
+            "pid": os.getpid(),
+            "uptime": int(time.time() - self.started),
+            "network": self.net.name,
+            "peers": len(self.net.network.peers),
+            "replication": self.net.replication,
+            **self.counters,
+        }
+        lines = [f"STAT {k} {v}\r\n" for k, v in stats.items()]
+        return ("".join(lines) + "END\r\n").encode()
+
+    # ------------------------------------------------------------------ #
+    # Ring reloads
+    # ------------------------------------------------------------------ #
+    async def _watch(self) -> None:
+        path = self.net.network.file_path
+        seen = _mtime(path)
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            mtime = _mtime(path)
+            if mtime == seen:
+                continue
+            seen = mtime
+            try:
+                await self.net.reload()
+            except Exception as exc:
+                print(f"⚠️  Reloading {path} failed, keeping the old ring: {exc}")
+                continue
+            self.counters["ring_reloads"] += 1
+            print(f"🔄 Reloaded {self.net.name}: peers {self.net.network.peers}")
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    async def serve(self) -> None:
+        """Listen until cancelled."""
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        watcher = asyncio.create_task(self._watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            await self.net.close()
+
+
+def _mtime(path) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="peercache memcached proxy")
+    parser.add_argument("network", help="network to route for")
+    parser.add_argument("-p", "--port", type=int, default=11311)
+    parser.add_argument("-l", "--host", default="localhost")
+    parser.add_argument("-c", "--connections", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    args = parser.parse_args()
+    proxy = MemcachedProxy(
+        args.network, args.port, args.host, args.connections, args.timeout
+    )
+    try:
+        asyncio.run(proxy.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,90 @@
+import asyncio
 import json
 import os
 import random
 import signal
-import statistics as stats
 import sys
 import time
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Sequence, Tuple
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 
+from peercache.core.histogram import LatencyHistogram
+from peercache.parser.async_network import AsyncNetwork
+from peercache.parser.collector import ClusterCollector, StatsRecorder
 from peercache.parser.manager import NetworkManager
 from peercache.parser.network import Network
 from peercache.parser.peer import Peer
+from testing.workload import (
+    OP_GET,
+    OP_SET,
+    Op,
+    WorkloadSpec,
+    key_name,
+    read_trace,
+)
 
 from pathlib import Path
 from datetime import datetime
 
 # ───────────────────────── helpers ────────────────────────── #
-def _rand_val(size: int) -> str:
-    return os.urandom(size).hex()
+_PAYLOAD = b""
 
 
-def _pct(series: List[float], q: float) -> float:
-    if not series:
-        return 0.0
-    k = int(round(q / 100 * (len(series) - 1)))
-    return sorted(series)[k]
+def _rand_val(size: int) -> bytes:
+    """Random payload sliced from one shared pool instead of fresh urandom."""
+    global _PAYLOAD
+    if len(_PAYLOAD) < size:
+        _PAYLOAD = os.urandom(max(size, 2 * len(_PAYLOAD), 1 << 20))
+    return _PAYLOAD[:size]
+
+
+def _schedule(wid: int, workers: int, rate: Optional[float]) -> Tuple[float, float]:
+    """
+    Per-worker open-loop schedule: (first intended send time, interval).
+
+    Each worker owns ``rate / workers`` ops/s, staggered so arrivals across
+    workers are evenly spaced. Closed loop (``rate`` None) returns (0, 0).
+    """
+    if not rate:
+        return 0.0, 0.0
+    interval = workers / rate
+    return time.perf_counter() + interval * wid / workers, interval
 
 
 # ───────────────────────── workload thread ─────────────────── #
+def _worker_ops(
+    wid: int,
+    workers: int,
+    reqs: int,
+    value_size: int,
+    ghost_ratio: float,
+    ttl_ratio: float,
+    workload: WorkloadSpec,
+    trace: Optional[str],
+) -> Tuple[List[str], Iterator[Op]]:
+    """
+    Keys this worker pre-loads, plus its mixed-phase ops.
+
+    Synthetic ops share one keyspace across workers (each warms up every
+    ``workers``-th key). A trace is streamed lazily, every worker taking
+    every ``workers``-th record, and is not pre-loaded.
+    """
+    if trace:
+        return [], islice(read_trace(trace), wid, wid + reqs * workers, workers)
+    keys = workload.keys or workers * reqs
+    rng = np.random.default_rng(random.randrange(2**32))
+    ops = workload.generate(
+        rng, reqs, keys, value_size, ghost_ratio, ttl_ratio, start=wid * reqs
+    )
+    return [key_name(i) for i in range(wid, keys, workers)], ops
+
+
 def _one_worker(
     net: Network,
     wid: int,
@@ -38,48 +92,175 @@ def _one_worker(
     value_size: int,
     ghost_ratio: float,
     ttl_ratio: float,
-) -> Dict[str, List[float]]:
+    workers: int = 1,
+    rate: Optional[float] = None,
+    workload: Optional[WorkloadSpec] = None,
+    trace: Optional[str] = None,
+) -> Dict[str, list]:
     """
-    Warm-up SETs every key, then mixed read/write:
-      - 80 % reads, 20 % writes
+    Warm-up SETs every key, then mixed read/write/delete as drawn from
+    ``workload`` (default: uniform keys, 80 % reads, 20 % writes) or
+    replayed from ``trace``:
       - ghost_ratio chance of reading an unknown key
       - ttl_ratio of writes get expire=2 s
-    """
-    lat: List[float] = []
-    hits = misses = writes = 0
 
-    keys = [f"{wid}:{i}" for i in range(reqs)]
+    With ``rate`` (total ops/s across ``workers``) the mixed phase is open
+    loop: ops follow a fixed schedule and latency is measured from each op's
+    intended send time, so queueing behind a slow op is counted. Warm-up
+    latencies are then left out of the histogram.
+    """
+    lat = LatencyHistogram()
+    hits = misses = writes = deletes = 0
+    warm, ops = _worker_ops(
+        wid, workers, reqs, value_size, ghost_ratio, ttl_ratio,
+        workload or WorkloadSpec(), trace,
+    )
 
     # warm-up
-    for k in keys:
-        t0 = time.perf_counter_ns()
+    for k in warm:
+        t0 = time.perf_counter()
         net.cache_set(k, _rand_val(value_size))
-        lat.append((time.perf_counter_ns() - t0) / 1_000)
+        if not rate:
+            lat.record((time.perf_counter() - t0) * 1e6)
 
     time.sleep(0.05)
 
     # mixed phase
-    for _ in range(reqs):
-        if random.random() < 0.8:  # READ
-            if random.random() < ghost_ratio:
-                k = f"ghost:{random.randint(0, 1_000_000)}"
+    next_send, interval = _schedule(wid, workers, rate)
+    for op in ops:
+        t0 = time.perf_counter()
+        if interval:
+            if next_send > t0:
+                time.sleep(next_send - t0)
+            t0, next_send = next_send, next_send + interval
+        if op.op == OP_GET:
+            res = net.cache_get(op.key)
+            lat.record((time.perf_counter() - t0) * 1e6)
+            if res != "MISS":
+                hits += 1
             else:
-                k = random.choice(keys)
-            t0 = time.perf_counter_ns()
-            res = net.cache_get(k)
-            lat.append((time.perf_counter_ns() - t0) / 1_000)
+                misses += 1
+            continue
+        if op.op == OP_SET:
+            # Through cache_set so the near cache is invalidated.
+            net.cache_set(op.key, _rand_val(op.size or value_size), expire=op.ttl)
+            writes += 1
+        else:
+            net.cache_delete(op.key)
+            deletes += 1
+        if interval:
+            lat.record((time.perf_counter() - t0) * 1e6)
+
+    return {
+        "lat": [lat],
+        "warmup": [len(warm)],
+        "hits": [hits],
+        "misses": [misses],
+        "writes": [writes],
+        "deletes": [deletes],
+    }
+
+
+# ───────────────────────── asyncio workload ─────────────────── #
+async def _one_async_worker(
+    anet: AsyncNetwork,
+    wid: int,
+    reqs: int,
+    value_size: int,
+    ghost_ratio: float,
+    ttl_ratio: float,
+    workers: int = 1,
+    rate: Optional[float] = None,
+    workload: Optional[WorkloadSpec] = None,
+    trace: Optional[str] = None,
+) -> Dict[str, list]:
+    """Coroutine twin of ``_one_worker``; same phases, op mix and schedule."""
+    lat = LatencyHistogram()
+    hits = misses = writes = deletes = 0
+    warm, ops = _worker_ops(
+        wid, workers, reqs, value_size, ghost_ratio, ttl_ratio,
+        workload or WorkloadSpec(), trace,
+    )
+
+    for k in warm:
+        t0 = time.perf_counter()
+        await anet.set(k, _rand_val(value_size))
+        if not rate:
+            lat.record((time.perf_counter() - t0) * 1e6)
+
+    await asyncio.sleep(0.05)
+
+    next_send, interval = _schedule(wid, workers, rate)
+    for op in ops:
+        t0 = time.perf_counter()
+        if interval:
+            if next_send > t0:
+                await asyncio.sleep(next_send - t0)
+            t0, next_send = next_send, next_send + interval
+        if op.op == OP_GET:
+            res = await anet.get(op.key)
+            lat.record((time.perf_counter() - t0) * 1e6)
             if res != "MISS":
                 hits += 1
             else:
                 misses += 1
-        else:  # WRITE
-            k = random.choice(keys)
-            ttl = 2 if random.random() < ttl_ratio else 0
-            for pid in net.ring.get_n(k, 1):
-                Peer(pid)._client().set(k, _rand_val(value_size), expire=ttl)
+            continue
+        if op.op == OP_SET:
+            await anet.set(op.key, _rand_val(op.size or value_size), expire=op.ttl)
             writes += 1
+        else:
+            await anet.delete(op.key)
+            deletes += 1
+        if interval:
+            lat.record((time.perf_counter() - t0) * 1e6)
+
+    return {
+        "lat": [lat],
+        "warmup": [len(warm)],
+        "hits": [hits],
+        "misses": [misses],
+        "writes": [writes],
+        "deletes": [deletes],
+    }
+
+
+async def _run_async_workers(
+    name: str, workers: int, *args
+) -> List[Dict[str, list]]:
+    async with AsyncNetwork(name) as anet:
+        return await asyncio.gather(
+            *(_one_async_worker(anet, w, *args) for w in range(workers))
+        )
 
-    return {"lat": lat, "hits": [hits], "misses": [misses], "writes": [writes]}
+
+# ───────────────────────── process workload ─────────────────── #
+def _process_worker(
+    name: str, wids: List[int], args: Tuple, seed: int
+) -> Dict[str, list]:
+    """
+    Body of one benchmark process: its own ``Network`` (and therefore its own
+    connection pools) driving ``wids`` with one thread each. Returns a
+    compact summary: one merged histogram plus counters, including this
+    process's L1/hedge counts that the parent's ``Network`` never sees.
+    """
+    random.seed(seed)
+    net = Network(name)
+    with ThreadPoolExecutor(max_workers=len(wids)) as pool:
+        futs = [pool.submit(_one_worker, net, w, *args) for w in wids]
+        parts = [f.result() for f in futs]
+
+    out: Dict[str, list] = defaultdict(list)
+    for part in parts:
+        for k, v in part.items():
+            out[k].extend(v)
+    lat = LatencyHistogram()
+    for part_lat in out["lat"]:
+        lat.merge(part_lat)
+    out["lat"] = [lat]
+    out["l1_hits"] = [net.l1.stats["hits"] if net.l1 is not None else 0]
+    out["hedges_sent"] = [net.hedge_stats["sent"]]
+    out["hedges_won"] = [net.hedge_stats["won"]]
+    return dict(out)
 
 
 # ───────────────────────── single stage ─────────────────────── #
@@ -90,35 +271,77 @@ def _run_stage(
     value_size: int,
     ghost_ratio: float,
     ttl_ratio: float,
+    driver: str = "threads",
+    rate: Optional[float] = None,
+    processes: Optional[int] = None,
+    workload: Optional[WorkloadSpec] = None,
+    trace: Optional[str] = None,
 ) -> Dict:
     agg = defaultdict(list)
+    hedges_before = dict(net.hedge_stats)
+    l1_before = net.l1.stats["hits"] if net.l1 is not None else 0
+    # Everything a worker needs after its id, identical for every driver.
+    args = (
+        reqs, value_size, ghost_ratio, ttl_ratio, workers, rate, workload, trace
+    )
     start = time.perf_counter()
 
-    with ThreadPoolExecutor(max_workers=workers) as pool:
-        futs = [
-            pool.submit(
-                _one_worker, net, w, reqs, value_size, ghost_ratio, ttl_ratio
-            )
-            for w in range(workers)
-        ]
-        for f in as_completed(futs):
-            part = f.result()
-            for k, v in part.items():
-                agg[k].extend(v)
+    if driver == "asyncio":
+        # One event loop; ``workers`` becomes the number of in-flight coroutines.
+        parts = asyncio.run(_run_async_workers(net.name, workers, *args))
+    elif driver == "processes":
+        # N processes × M threads: worker ids are dealt round-robin.
+        procs = min(processes or os.cpu_count() or 1, workers)
+        seeds = [random.randrange(2**32) for _ in range(procs)]
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            futs = [
+                pool.submit(
+                    _process_worker,
+                    net.name,
+                    list(range(p, workers, procs)),
+                    args,
+                    seeds[p],
+                )
+                for p in range(procs)
+            ]
+            parts = [f.result() for f in futs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futs = [
+                pool.submit(_one_worker, net, w, *args) for w in range(workers)
+            ]
+            parts = [f.result() for f in as_completed(futs)]
+
+    for part in parts:
+        for k, v in part.items():
+            agg[k].extend(v)
+
+    lat = LatencyHistogram()
+    for part_lat in agg["lat"]:
+        lat.merge(part_lat)
 
     dur = time.perf_counter() - start
-    total_ops = workers * reqs * 2
-    thr = total_ops / dur
-
     hits = sum(agg["hits"])
     misses = sum(agg["misses"])
-    hit_rate = hits / (hits + misses) if hits + misses else 0.0
+    writes = sum(agg["writes"])
+    deletes = sum(agg["deletes"])
+    total_ops = sum(agg["warmup"]) + hits + misses + writes + deletes
+    thr = total_ops / dur
 
-    evictions = bytes_used = 0
-    for pid in net.peers:
-        s = Peer(pid).stats()
-        evictions += int(s["evictions"])
-        bytes_used += int(s["bytes"])
+    hit_rate = hits / (hits + misses) if hits + misses else 0.0
+    if driver == "processes":
+        l1_hits = sum(agg["l1_hits"])
+        hedges_sent, hedges_won = sum(agg["hedges_sent"]), sum(agg["hedges_won"])
+    else:
+        l1_hits = (net.l1.stats["hits"] - l1_before) if net.l1 is not None else 0
+        hedges_sent = net.hedge_stats["sent"] - hedges_before["sent"]
+        hedges_won = net.hedge_stats["won"] - hedges_before["won"]
+    reads = hits + misses
+
+    # One concurrent round of ``stats`` instead of a round trip per peer.
+    peer_stats = ClusterCollector(net, slabs=False).snapshot().values()
+    evictions = sum(int(s["evictions"]) for s in peer_stats if s is not None)
+    bytes_used = sum(int(s["bytes"]) for s in peer_stats if s is not None)
 
     return {
         "workers": workers,
@@ -126,13 +349,27 @@ def _run_stage(
         "ops": total_ops,
         "dur": dur,
         "thr": thr,
-        "lat_avg": stats.mean(agg["lat"]),
-        "lat_p95": _pct(agg["lat"], 95),
+        "rate": rate,
+        "lat_avg": lat.mean,
+        "lat_p50": lat.percentile(50),
+        "lat_p95": lat.percentile(95),
+        "lat_p99": lat.percentile(99),
+        "lat_p999": lat.percentile(99.9),
+        "lat_max": lat.max,
         "hits": hits,
         "misses": misses,
+        "writes": writes,
+        "deletes": deletes,
         "hit_rate": hit_rate,
+        "l1_hits": l1_hits,
+        "l1_hit_rate": l1_hits / reads if reads else 0.0,
+        "remote_hit_rate": (hits - l1_hits) / reads if reads else 0.0,
         "evictions": evictions,
         "bytes": bytes_used,
+        "hedges_sent": hedges_sent,
+        "hedges_won": hedges_won,
+        # (µs, percentile) points; stripped from the printed stage summary.
+        "lat_dist": lat.cdf(),
     }
 
 
@@ -141,17 +378,64 @@ def run_benchmark(
     *,
     name: str,
     peers: int = 8,
-    memory_mb: int = 32,
+    memory_mb: int | Sequence[int] = 32,
     value_size: int = 16_384,
     ghost_ratio: float = 0.15,
     ttl_ratio: float = 0.25,
     scenarios: Sequence[Tuple[int, int]] = ((2, 400), (4, 800)),
     seed: int = 42,
     plot: bool = True,
+    replication: int = 1,
+    hedge: bool = False,
+    hedge_delay_ms: float | None = None,
+    l1_bytes: int = 0,
+    l1_ttl: float = 1.0,
+    driver: str = "threads",
+    compress_threshold: int = 0,
+    rate: float | None = None,
+    processes: int | None = None,
+    workload: WorkloadSpec | None = None,
+    trace: str | None = None,
+    backend: str = "memcached",
+    stats_interval: float = 0.0,
+    weighted: bool = True,
+    bounded_load: float = 0.0,
+    placement: str = "ring",
 ) -> List[Dict]:
     """
     Execute a full ramp test and (optionally) save 5 PNG charts.
 
+    Set ``hedge=True`` (with ``replication`` > 1) to compare p95/p99 with
+    hedged reads; ``hedge_delay_ms=None`` hedges at the observed p95.
+    ``l1_bytes`` > 0 enables the in-process near cache; stages then report
+    L1 and remote hit rates separately. ``driver="asyncio"`` runs each
+    stage's workers as coroutines on one event loop via ``AsyncNetwork``;
+    ``driver="processes"`` spreads them over ``processes`` worker processes
+    (default: CPU count), each with its own ``Network`` and threads, so the
+    client side isn't capped by one GIL.
+    ``workload`` (a ``testing.workload.WorkloadSpec``) sets the key
+    distribution (uniform/zipf/hotspot/sequential), read/write/delete mix and
+    value-size distribution; ``trace`` instead replays a recorded op log
+    (binary or CSV, see ``write_trace``), streamed lazily with ``reqs`` ops
+    per worker.
+    ``backend`` picks each peer's server (see ``Peer.start``): ``python``
+    and ``inprocess`` use the bundled stand-in and need no memcached binary;
+    ``null`` discards writes so stages measure only the client path.
+    ``memory_mb`` may list per-peer sizes (cycled over the peers); with
+    ``weighted`` each peer gets vnodes in proportion to its memory, otherwise
+    all peers get the same share. ``bounded_load`` (epsilon) caps every peer
+    at (1 + epsilon) × the mean in-flight load, spilling to the next owner.
+    ``placement`` selects the key placement strategy (ring, rendezvous, jump
+    or maglev; see ``peercache.core.placement``).
+    ``stats_interval`` > 0 streams cluster stats samples (ops/s, hit ratio,
+    evictions/s, bytes, slabs) to ``results/simulations/<name>_<ts>.stats.jsonl``
+    every that many seconds for the whole run.
+    ``compress_threshold`` > 0 zlib-compresses values at least that large
+    (random payloads rarely shrink, so they are stored as-is).
+    ``rate`` (ops/s across all workers) makes the mixed phase open loop:
+    latency is measured from each op's scheduled send time, so stages
+    report queueing delay that the closed loop hides.
+
     Returns the per-stage result list for programmatic inspection.
     """
     random.seed(seed)
@@ -160,24 +444,50 @@ def run_benchmark(
     mgr = NetworkManager()
     mgr.create_network(name)
     net = Network(name)
+    net.set_replication(replication)
+    net.set_hedging(hedge, hedge_delay_ms)
+    net.set_near_cache(l1_bytes, l1_ttl)
+    net.set_compression(compress_threshold)
+    net.set_bounded_load(bounded_load)
+    net.set_placement(placement)
+    sizes = [memory_mb] if isinstance(memory_mb, int) else list(memory_mb)
     peers_list: List[Peer] = []
     for i in range(peers):
         p = Peer(f"{name}_p{i}")
-        p.start(memory_mb=memory_mb)
+        size = sizes[i % len(sizes)]
+        p.start(memory_mb=size, backend=backend)
         peers_list.append(p)
-        net.add_peer(p.id)
+        weight = float(size) if weighted else 1.0
+        if p.id in net.peers:  # left over from an earlier run of this name
+            net.set_weight(p.id, weight)
+        else:
+            net.weights[p.id] = weight
+            net.add_peer(p.id)
+
+    recorder = None
+    if stats_interval > 0:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = Path("results/simulations") / f"{name}_{ts}.stats.jsonl"
+        recorder = StatsRecorder(net, path, stats_interval).start()
+        print(f"📈 Recording cluster stats every {stats_interval}s → {path}")
 
     # --- run workload matrix -------------------------------------------- #
     results = []
     for w, r in scenarios:
         print(f"\n▶ Stage: {w} workers × {r} req")
         res = _run_stage(
-            net, w, r, value_size, ghost_ratio, ttl_ratio
+            net, w, r, value_size, ghost_ratio, ttl_ratio,
+            driver=driver, rate=rate, processes=processes,
+            workload=workload, trace=trace,
         )
         results.append(res)
-        print(json.dumps(res, indent=2))
+        summary = {k: v for k, v in res.items() if k != "lat_dist"}
+        print(json.dumps(summary, indent=2))
         time.sleep(2.5)  # give TTL items a chance to expire
 
+    if recorder is not None:
+        recorder.stop()
+
     # --- visualisation --------------------------------------------------- #
     cfg = dict(
         name=name,
@@ -188,6 +498,22 @@ def run_benchmark(
         ttl_ratio=ttl_ratio,
         scenarios=list(scenarios),
         seed=seed,
+        replication=replication,
+        hedge=hedge,
+        hedge_delay_ms=hedge_delay_ms,
+        l1_bytes=l1_bytes,
+        l1_ttl=l1_ttl,
+        driver=driver,
+        processes=processes,
+        workload=asdict(workload) if workload else None,
+        trace=trace,
+        backend=backend,
+        compress_threshold=compress_threshold,
+        rate=rate,
+        stats_interval=stats_interval,
+        weighted=weighted,
+        bounded_load=bounded_load,
+        placement=placement,
     )
     print(f"\n🔧 Configuration:\n{json.dumps(cfg, indent=2)}")
     if plot:
@@ -242,6 +568,7 @@ def _make_plots(results: List[Dict], *, prefix: str = "") -> None:
     fig2, ax = plt.subplots()
     ax.plot(x, [r["lat_avg"] for r in results], "o-", label="avg")
     ax.plot(x, [r["lat_p95"] for r in results], "s--", label="p95")
+    ax.plot(x, [r.get("lat_p99", 0.0) for r in results], "^:", label="p99")
     ax.set_title("Latency")
     ax.set_xlabel("Workers")
     ax.set_ylabel("µs")
@@ -283,11 +610,11 @@ def _make_plots(results: List[Dict], *, prefix: str = "") -> None:
     # 1 ─ Latency CDF (per stage)
     fig6 = plt.figure()
     for r in results:
-        sorted_lat = sorted(r["lat_dist"]) if "lat_dist" in r else []
-        if not sorted_lat:
+        points = r.get("lat_dist") or []
+        if not points:
             continue
-        y = [i / len(sorted_lat) * 100 for i in range(len(sorted_lat))]
-        plt.plot(sorted_lat, y, label=f'{r["workers"]} workers')
+        xs, ys = zip(*points)
+        plt.plot(xs, ys, label=f'{r["workers"]} workers')
     plt.title("Latency CDF")
     plt.xlabel("µs")
     plt.ylabel("Percentile")
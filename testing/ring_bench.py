@@ -0,0 +1,249 @@
+import argparse
+import json
+import statistics as stats
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from peercache.core.hashing import moved_fraction
+from peercache.core.placement import PLACEMENTS, make_placement
+
+OUT_DIR = Path("results/ring")
+BASELINE = OUT_DIR / "baseline.json"
+
+# Metric -> True if bigger is better. Speed metrics are noisy, so they get a
+# looser tolerance than placement metrics, which are deterministic.
+_SPEED = {"lookups_per_sec": True, "batch_lookups_per_sec": True, "build_ms": False}
+_QUALITY = {
+    "memory_bytes": False,
+    "load_cv": False,
+    "load_max_mean": False,
+    "moved_add": False,
+    "moved_remove": False,
+    "moved_remove_first": False,
+}
+
+
+# ───────────────────────── measurements ─────────────────────── #
+def _keys(count: int) -> List[str]:
+    return [f"key:{i}" for i in range(count)]
+
+
+def _best_rate(fn, ops: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return ops / best if best else 0.0
+
+
+def bench_case(
+    peers: int,
+    vnodes: int,
+    replication: int,
+    hash_fn: str = "md5",
+    keys: int = 20_000,
+    repeat: int = 3,
+    placement: str = "ring",
+) -> Dict:
+    """
+    Measure one placement configuration: speed, memory and placement quality.
+    ``vnodes`` only applies to the ring.
+    """
+    ids = [f"p{i}" for i in range(peers)]
+    sample = _keys(keys)
+
+    def build():
+        return make_placement(
+            placement, ids, hash_fn=hash_fn, replicas=replication, virtual_nodes=vnodes
+        )
+
+    build_ms = 1000 / _best_rate(build, 1, repeat)
+    ring = build()
+
+    get_n = ring.get_n
+    lookups = _best_rate(lambda: [get_n(k, replication) for k in sample], keys, repeat)
+    batch = _best_rate(lambda: ring.get_n_batch(sample, replication), keys, repeat)
+
+    # Primary-owner load only: replicas just repeat the same segments.
+    load = list(ring.load_histogram(sample, 1).values())
+    mean = stats.mean(load)
+
+    before = [get_n(k, 1)[0] for k in sample]
+    added = f"p{peers}"
+    moved_add = moved_fraction(ring.add_peer(added))
+    after = [get_n(k, 1)[0] for k in sample]
+    moved_keys = sum(a != b for a, b in zip(before, after)) / keys
+    moved_remove = moved_fraction(ring.remove_peer(added))
+    # Removing a peer other than the newest one (jump hash's worst case).
+    moved_first = moved_fraction(build().remove_peer(ids[0]))
+
+    return {
+        "placement": placement,
+        "peers": peers,
+        "vnodes": vnodes if placement == "ring" else None,
+        "replication": replication,
+        "hash_fn": hash_fn,
+        "lookups_per_sec": lookups,
+        "batch_lookups_per_sec": batch,
+        "build_ms": build_ms,
+        "memory_bytes": ring.memory_usage()["total"],
+        "load_cv": stats.pstdev(load) / mean if mean else 0.0,
+        "load_max_mean": max(load) / mean if mean else 0.0,
+        "moved_add": moved_add,
+        "moved_add_keys": moved_keys,
+        "moved_remove": moved_remove,
+        "moved_remove_first": moved_first,
+        "moved_ideal": 1 / (peers + 1),
+    }
+
+
+def run_suite(
+    peer_counts: Sequence[int] = (4, 8, 16, 32),
+    vnodes: Sequence[int] = (50, 100, 200),
+    replication: Sequence[int] = (1, 2, 3),
+    hash_fns: Sequence[str] = ("md5",),
+    keys: int = 20_000,
+    placements: Sequence[str] = ("ring",),
+) -> Dict[str, Dict]:
+    """Run every combination and return results keyed by case name."""
+    results: Dict[str, Dict] = {}
+    for placement in placements:
+        # Only the ring has vnodes; the other placements run once per cell.
+        vnode_axis = vnodes if placement == "ring" else vnodes[:1]
+        for hash_fn in hash_fns:
+            for p in peer_counts:
+                for v in vnode_axis:
+                    for r in replication:
+                        if r > p:
+                            continue
+                        name = case_name(hash_fn, p, v, r, placement)
+                        results[name] = bench_case(
+                            p, v, r, hash_fn, keys, placement=placement
+                        )
+                        _report(name, results[name])
+    return results
+
+
+def _report(name: str, res: Dict) -> None:
+    print(
+        f"{name:<28} {res['lookups_per_sec']:>12,.0f} get_n/s "
+        f"{res['batch_lookups_per_sec']:>12,.0f} batch/s "
+        f"{res['memory_bytes'] / 1024:>8.1f} KiB "
+        f"cv {res['load_cv']:.3f} max/mean {res['load_max_mean']:.2f} "
+        f"moved {res['moved_add']:.3f}/{res['moved_remove_first']:.3f} "
+        f"(ideal {res['moved_ideal']:.3f})"
+    )
+
+
+def case_name(
+    hash_fn: str, peers: int, vnodes: int, replication: int, placement: str = "ring"
+) -> str:
+    if placement != "ring":
+        return f"{placement}/{hash_fn}/p{peers}/r{replication}"
+    return f"{hash_fn}/p{peers}/v{vnodes}/r{replication}"
+
+
+# ───────────────────────── persistence & comparison ─────────── #
+def save(results: Dict[str, Dict], path: Optional[Path] = None) -> Path:
+    """Write results to ``results/ring/ring_<timestamp>.json`` (or *path*)."""
+    if path is None:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = OUT_DIR / f"ring_{ts}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"cases": results}, indent=2))
+    print(f"💾 Saved ring results → {path}")
+    return path
+
+
+def compare(
+    current: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    speed_tolerance: float = 0.20,
+    quality_tolerance: float = 0.02,
+) -> List[str]:
+    """
+    Return one message per metric that got worse than *baseline* by more than
+    the tolerance (relative). Cases missing from either side are skipped.
+    """
+    regressions: List[str] = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metrics, tol in ((_SPEED, speed_tolerance), (_QUALITY, quality_tolerance)):
+            for metric, higher_is_better in metrics.items():
+                old, new = base.get(metric), cur.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                if (-change if higher_is_better else change) > tol:
+                    regressions.append(
+                        f"{name} {metric}: {old:.4g} → {new:.4g} ({change:+.1%})"
+                    )
+    return regressions
+
+
+def _load(path: Path) -> Dict[str, Dict]:
+    return json.loads(path.read_text())["cases"]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Key-placement microbenchmark")
+    parser.add_argument("--peers", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--vnodes", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--replication", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--hash", nargs="+", default=["md5"], dest="hash_fns")
+    parser.add_argument(
+        "--placement",
+        nargs="+",
+        default=["ring"],
+        choices=list(PLACEMENTS),
+        dest="placements",
+        help="placement strategies to compare",
+    )
+    parser.add_argument("--keys", type=int, default=20_000)
+    parser.add_argument(
+        "--baseline", type=Path, default=BASELINE, help="baseline JSON to compare"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store this run as the baseline"
+    )
+    parser.add_argument("--speed-tolerance", type=float, default=0.20)
+    parser.add_argument("--quality-tolerance", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.peers,
+        args.vnodes,
+        args.replication,
+        args.hash_fns,
+        args.keys,
+        args.placements,
+    )
+    save(results)
+    if args.save_baseline:
+        save(results, args.baseline)
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; rerun with --save-baseline.")
+        return 0
+
+    regressions = compare(
+        results,
+        _load(args.baseline),
+        args.speed_tolerance,
+        args.quality_tolerance,
+    )
+    for line in regressions:
+        print(f"⚠️  REGRESSION {line}")
+    if not regressions:
+        print(f"✅ No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import csv
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+OP_GET, OP_SET, OP_DELETE = 0, 1, 2
+OP_NAMES = ("get", "set", "delete")
+
+# Binary trace: magic, then one record per op followed by the key bytes.
+_TRACE_MAGIC = b"PCTRACE1"
+_RECORD = struct.Struct("<BIHI")  # op, ttl, key length, value size
+
+
+class Op(NamedTuple):
+    op: int
+    key: str
+    size: int = 0
+    ttl: int = 0
+
+
+@dataclass
+class WorkloadSpec:
+    """
+    Synthetic workload: key distribution, op mix and value sizes.
+
+    ``distribution`` is ``uniform``, ``zipf`` (skew ``theta``), ``hotspot``
+    (``hot_ops`` of traffic on the first ``hot_fraction`` of keys) or
+    ``sequential`` (each worker walks the keyspace from its own offset).
+    Writes get whatever ``read_ratio`` and ``delete_ratio`` leave over.
+    ``size_dist`` is ``fixed``, ``uniform`` (value_size ± ``size_spread``
+    × value_size) or ``lognormal`` (median value_size, sigma ``size_spread``).
+    """
+
+    distribution: str = "uniform"
+    keys: Optional[int] = None  # keyspace size; None = workers × reqs
+    theta: float = 0.99
+    hot_fraction: float = 0.2
+    hot_ops: float = 0.8
+    read_ratio: float = 0.8
+    delete_ratio: float = 0.0
+    size_dist: str = "fixed"
+    size_spread: float = 0.5
+
+    def key_indices(
+        self, rng: np.random.Generator, n: int, keys: int, start: int = 0
+    ) -> np.ndarray:
+        if self.distribution == "uniform":
+            return rng.integers(0, keys, n)
+        if self.distribution == "zipf":
+            return np.searchsorted(_zipf_cdf(keys, self.theta), rng.random(n))
+        if self.distribution == "hotspot":
+            hot = max(1, int(keys * self.hot_fraction))
+            in_hot = rng.random(n) < self.hot_ops
+            cold = rng.integers(hot if hot < keys else 0, keys, n)
+            return np.where(in_hot, rng.integers(0, hot, n), cold)
+        if self.distribution == "sequential":
+            return (start + np.arange(n)) % keys
+        raise ValueError(f"Unknown key distribution '{self.distribution}'")
+
+    def value_sizes(
+        self, rng: np.random.Generator, n: int, value_size: int
+    ) -> np.ndarray:
+        if self.size_dist == "fixed":
+            sizes = np.full(n, value_size)
+        elif self.size_dist == "uniform":
+            spread = int(value_size * self.size_spread)
+            sizes = rng.integers(value_size - spread, value_size + spread + 1, n)
+        elif self.size_dist == "lognormal":
+            sizes = rng.lognormal(np.log(value_size), self.size_spread, n)
+        else:
+            raise ValueError(f"Unknown value size distribution '{self.size_dist}'")
+        return np.maximum(sizes, 1).astype(np.int64)
+
+    def generate(
+        self,
+        rng: np.random.Generator,
+        n: int,
+        keys: int,
+        value_size: int,
+        ghost_ratio: float = 0.0,
+        ttl_ratio: float = 0.0,
+        start: int = 0,
+    ) -> Iterator[Op]:
+        """
+        Yield *n* ops drawn in one vectorised pass; only the key strings are
+        built per op. ``ghost_ratio`` of reads target never-written keys and
+        ``ttl_ratio`` of writes get a 2 s TTL.
+        """
+        u = rng.random(n)
+        ops = np.where(
+            u < self.read_ratio,
+            OP_GET,
+            np.where(u < self.read_ratio + self.delete_ratio, OP_DELETE, OP_SET),
+        )
+        idx = self.key_indices(rng, n, keys, start)
+        ghost = (ops == OP_GET) & (rng.random(n) < ghost_ratio)
+        ghost_ids = rng.integers(0, 1_000_000, n)
+        ttl = np.where((ops == OP_SET) & (rng.random(n) < ttl_ratio), 2, 0)
+        sizes = self.value_sizes(rng, n, value_size)
+
+        for op, i, g, gid, size, t in zip(
+            ops.tolist(),
+            idx.tolist(),
+            ghost.tolist(),
+            ghost_ids.tolist(),
+            sizes.tolist(),
+            ttl.tolist(),
+        ):
+            yield Op(op, f"ghost:{gid}" if g else key_name(i), size, t)
+
+
+def key_name(index: int) -> str:
+    return f"k:{index}"
+
+
+@lru_cache(maxsize=8)
+def _zipf_cdf(keys: int, theta: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, keys + 1, dtype=np.float64) ** theta
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    return cdf
+
+
+# ───────────────────────── trace files ─────────────────────────── #
+def write_trace(path: str | Path, ops: Iterable[Op]) -> int:
+    """
+    Record *ops* to *path*: CSV (``op,key,size,ttl``) for ``.csv`` files,
+    otherwise the compact binary format. Returns the number of ops written.
+    """
+    path = Path(path)
+    count = 0
+    if path.suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["op", "key", "size", "ttl"])
+            for op in ops:
+                writer.writerow([OP_NAMES[op.op], op.key, op.size, op.ttl])
+                count += 1
+        return count
+
+    with open(path, "wb") as f:
+        f.write(_TRACE_MAGIC)
+        for op in ops:
+            key = op.key.encode()
+            f.write(_RECORD.pack(op.op, op.ttl, len(key), op.size) + key)
+            count += 1
+    return count
+
+
+def read_trace(path: str | Path) -> Iterator[Op]:
+    """Stream ops from a trace written by ``write_trace``, one at a time."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        binary = f.read(len(_TRACE_MAGIC)) == _TRACE_MAGIC
+
+    if not binary:
+        codes = {name: code for code, name in enumerate(OP_NAMES)}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                yield Op(
+                    codes[row["op"].lower()],
+                    row["key"],
+                    int(row.get("size") or 0),
+                    int(row.get("ttl") or 0),
+                )
+        return
+
+    with open(path, "rb") as f:
+        f.seek(len(_TRACE_MAGIC))
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            op, ttl, key_len, size = _RECORD.unpack(header)
+            yield Op(op, f.read(key_len).decode(), size, ttl)